@@ -0,0 +1,96 @@
+"""
+A simple on-disk store of examples which have falsified a hypothesis in the
+past, so that later runs can try them again before doing any search.
+"""
+
+import os
+import pickle
+import hashlib
+import binascii
+
+try:
+    replace = os.replace
+except AttributeError:
+    # Python 2 has no os.replace. Its os.rename only fails if the target
+    # exists on Windows, where a failed save does no harm.
+    replace = os.rename
+
+
+class ExampleDatabase(object):
+    """
+    Stores examples in a directory with one sub-directory per key and one
+    pickled file per example. Files are named after a digest of their
+    contents, so saving the same example twice is a no-op.
+
+    Examples which cannot be pickled are silently not saved and files which
+    cannot be loaded (e.g. because the types they reference no longer exist)
+    are silently deleted. The database is purely an optimisation, so nothing
+    that goes wrong with it should ever cause a test to fail.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __repr__(self):
+        return 'ExampleDatabase(%r)' % (self.path,)
+
+    def directory_for(self, key):
+        return os.path.join(
+            self.path, binascii.hexlify(key).decode('ascii'))
+
+    def save(self, key, example):
+        try:
+            data = pickle.dumps(example, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        directory = self.directory_for(key)
+        target = os.path.join(directory, hashlib.sha1(data).hexdigest())
+        if os.path.exists(target):
+            return
+        # Write to a temporary file and move it into place so that a
+        # concurrent reader never sees a partially written example.
+        tmp = '%s.%d.tmp' % (target, os.getpid())
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            replace(tmp, target)
+        except (OSError, IOError):
+            self.__remove(tmp)
+
+    def fetch(self, key):
+        """
+        Returns a list of every example saved under key, in a consistent
+        order.
+        """
+        directory = self.directory_for(key)
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return []
+        results = []
+        for name in names:
+            if name.endswith('.tmp'):
+                continue
+            filename = os.path.join(directory, name)
+            try:
+                with open(filename, 'rb') as f:
+                    results.append(pickle.load(f))
+            except Exception:
+                self.__remove(filename)
+        return results
+
+    def delete(self, key, example):
+        try:
+            data = pickle.dumps(example, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        self.__remove(os.path.join(
+            self.directory_for(key), hashlib.sha1(data).hexdigest()))
+
+    def __remove(self, filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
@@ -1,4 +1,5 @@
 from collections import namedtuple
+import sys
 
 
 Just = namedtuple('Just', 'value')
@@ -36,3 +37,34 @@ SampledFrom = namedtuple('SampledFrom', ('elements,'))
 
 def sampled_from(elements):
     return SampledFrom(tuple(elements))
+
+
+Characters = namedtuple(
+    'Characters', ('categories', 'min_codepoint', 'max_codepoint'))
+
+
+def characters(categories=None, min_codepoint=0, max_codepoint=None):
+    """
+    Describes single unicode characters, optionally restricted to the given
+    general categories (e.g. 'Lu' or 'Nd') and to a range of codepoints. By
+    default any character but a surrogate may be produced.
+    """
+    if categories is not None:
+        categories = tuple(sorted(set(categories)))
+    if max_codepoint is None:
+        max_codepoint = sys.maxunicode
+    return Characters(categories, min_codepoint, max_codepoint)
+
+
+Array = namedtuple('Array', ('shape', 'dtype'))
+
+
+def arrays(shape, dtype=float):
+    """
+    Describes numpy arrays of the given shape and dtype. shape may be a single
+    int for one dimensional arrays, and any dimension of it which is None
+    may be of any length.
+    """
+    if isinstance(shape, int) or shape is None:
+        shape = (shape,)
+    return Array(tuple(shape), dtype)
@@ -0,0 +1,123 @@
+"""
+Tables of which unicode codepoints are in which general category, stored as
+sorted intervals of codepoints so that sets of characters can be described
+and indexed without listing every character in them.
+"""
+
+from bisect import bisect_right
+import sys
+import unicodedata
+
+from hypothesis.internal.compat import unichr, xrange
+
+SURROGATES = (0xD800, 0xDFFF)
+
+_charmap = None
+
+
+def charmap():
+    """
+    A dict mapping each unicode general category to a tuple of inclusive
+    (start, end) codepoint intervals covering it. This is computed the first
+    time it is needed, which means looking at every codepoint once.
+    """
+    global _charmap
+    if _charmap is None:
+        tables = {}
+        for i in xrange(sys.maxunicode + 1):
+            intervals = tables.setdefault(
+                unicodedata.category(unichr(i)), [])
+            if intervals and intervals[-1][1] == i - 1:
+                intervals[-1][1] = i
+            else:
+                intervals.append([i, i])
+        _charmap = dict(
+            (category, tuple(tuple(r) for r in intervals))
+            for category, intervals in tables.items()
+        )
+    return _charmap
+
+
+def categories():
+    return sorted(charmap())
+
+
+class IntervalSet(object):
+    """
+    A set of codepoints given by sorted, non-overlapping intervals, which
+    can be indexed like a sorted list of its members. Both indexing and
+    finding the index of a codepoint are binary searches over the intervals.
+    """
+
+    def __init__(self, intervals):
+        merged = []
+        for start, end in sorted(intervals):
+            if start > end:
+                continue
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.intervals = tuple(tuple(r) for r in merged)
+        self.starts = [start for start, _ in self.intervals]
+        self.offsets = []
+        size = 0
+        for start, end in self.intervals:
+            self.offsets.append(size)
+            size += end - start + 1
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        if not (0 <= i < self.size):
+            raise IndexError('IntervalSet index out of range')
+        j = bisect_right(self.offsets, i) - 1
+        return self.starts[j] + (i - self.offsets[j])
+
+    def _interval_containing(self, codepoint):
+        j = bisect_right(self.starts, codepoint) - 1
+        if j >= 0 and codepoint <= self.intervals[j][1]:
+            return j
+        return None
+
+    def __contains__(self, codepoint):
+        return self._interval_containing(codepoint) is not None
+
+    def index(self, codepoint):
+        j = self._interval_containing(codepoint)
+        if j is None:
+            raise ValueError('%r is not in IntervalSet' % (codepoint,))
+        return self.offsets[j] + (codepoint - self.starts[j])
+
+    def __repr__(self):
+        return 'IntervalSet(%r)' % (self.intervals,)
+
+
+def query(categories=None, min_codepoint=0, max_codepoint=sys.maxunicode):
+    """
+    The IntervalSet of codepoints between min_codepoint and max_codepoint
+    inclusive which are in one of categories, or in any category other than
+    surrogates if categories is None.
+    """
+    if categories is None:
+        intervals = [
+            (min_codepoint, min(max_codepoint, SURROGATES[0] - 1)),
+            (max(min_codepoint, SURROGATES[1] + 1), max_codepoint),
+        ]
+    else:
+        tables = charmap()
+        unknown = set(categories) - set(tables)
+        if unknown:
+            raise ValueError(
+                'Unknown unicode categories %s. Expected some of %s' % (
+                    ', '.join(sorted(unknown)), ', '.join(sorted(tables))))
+        intervals = [
+            (max(start, min_codepoint), min(end, max_codepoint))
+            for category in categories
+            for start, end in tables[category]
+        ]
+    return IntervalSet(intervals)
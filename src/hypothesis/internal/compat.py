@@ -1,4 +1,6 @@
 import sys
+import inspect
+from collections import namedtuple
 
 PY3 = sys.version_info[0] == 3
 
@@ -6,12 +8,56 @@ if PY3:
     text_type = str
     binary_type = bytes
     xrange = range
+    unichr = chr
     ARG_NAME_ATTRIBUTE = 'arg'
     integer_types = (int,)
+
+    ArgSpec = namedtuple(
+        'ArgSpec', ('args', 'varargs', 'keywords', 'defaults'))
+
+    def getargspec(function):
+        # inspect.getargspec was removed in Python 3.11.
+        spec = inspect.getfullargspec(function)
+        return ArgSpec(spec.args, spec.varargs, spec.varkw, spec.defaults)
 else:
     text_type = unicode
     binary_type = str
     from __builtin__ import xrange as xr
     xrange = xr
+    unichr = unichr
     ARG_NAME_ATTRIBUTE = 'id'
     integer_types = (int, long)
+    getargspec = inspect.getargspec
+
+try:
+    from collections.abc import Mapping, MutableMapping, MutableSequence
+except ImportError:  # pragma: no cover
+    from collections import Mapping, MutableMapping, MutableSequence
+
+try:
+    from inspect import iscoroutine, iscoroutinefunction
+except ImportError:  # pragma: no cover
+    # No coroutines before Python 3.5, so nothing can be one.
+    def iscoroutine(value):
+        return False
+
+    def iscoroutinefunction(function):
+        return False
+
+
+def fork_context():
+    """
+    Returns something with the interface of the multiprocessing module whose
+    processes are started by forking the current one, or None if this platform
+    does not support that.
+    """
+    import multiprocessing
+    try:
+        return multiprocessing.get_context('fork')
+    except AttributeError:
+        # Python 2 has no contexts but always forks where it can.
+        if sys.platform.startswith('win'):
+            return None
+        return multiprocessing
+    except ValueError:
+        return None
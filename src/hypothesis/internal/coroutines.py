@@ -0,0 +1,85 @@
+"""
+Support for hypotheses and tests which are coroutine functions. This uses
+syntax which does not exist before Python 3.5, so it must only be imported
+once we know we have a coroutine to deal with.
+"""
+
+import asyncio
+import os
+
+from hypothesis.internal.statistics import timer
+from hypothesis.internal.evaluationcache import PASSED, FALSIFIED, REJECTED
+from hypothesis.verifier import UnsatisfiedAssumption
+
+_loop = None
+_loop_pid = None
+
+
+def event_loop():
+    """
+    The event loop that coroutines are run on. This is created on first use
+    and kept for subsequent ones, except that a forked worker process gets
+    its own rather than sharing its parent's.
+    """
+    global _loop, _loop_pid
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+    return _loop
+
+
+def run(coroutine):
+    return event_loop().run_until_complete(coroutine)
+
+
+async def evaluate_async(hypothesis, search_strategy, args, statistics):
+    """
+    The same as verifier.evaluate for a hypothesis which is a coroutine
+    function. The time recorded under test includes any time spent waiting
+    for the other examples being run at the same time.
+    """
+    started = timer()
+    args = search_strategy.copy(args)
+    started = statistics.record('copy', started)
+    try:
+        if await hypothesis(*args):
+            status = PASSED
+        else:
+            status = FALSIFIED
+    except AssertionError:
+        status = FALSIFIED
+    except UnsatisfiedAssumption:
+        status = REJECTED
+        statistics.assumptions_rejected += 1
+    statistics.record('test', started)
+    return status
+
+
+def evaluate_concurrently(hypothesis, search_strategy, examples, statistics):
+    """
+    Run a coroutine function hypothesis on all of examples at once, returning
+    their statuses in the same order as examples.
+    """
+    async def evaluate_all():
+        return await asyncio.gather(*[
+            evaluate_async(hypothesis, search_strategy, args, statistics)
+            for args in examples
+        ])
+    return run(evaluate_all())
+
+
+def falsifier_for(test, arguments):
+    """
+    The coroutine function version of the hypothesis that given builds for
+    a test, which passes if awaiting the test raises no exception.
+    """
+    async def to_falsify(xs):
+        testargs, testkwargs = xs
+        try:
+            await test(*(arguments + testargs), **testkwargs)
+            return True
+        except UnsatisfiedAssumption:
+            raise
+        except Exception:
+            return False
+    return to_falsify
@@ -0,0 +1,30 @@
+from hypothesis.internal.utils.hashitanyway import HashItAnyway
+
+PASSED = 'passed'
+FALSIFIED = 'falsified'
+REJECTED = 'rejected'
+
+
+class EvaluationCache(object):
+    """
+    Remembers the result of calling a hypothesis on each example it has been
+    called with, so that no phase of falsification has to pay for calling it
+    on the same value twice.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, example):
+        """
+        Returns one of PASSED, FALSIFIED or REJECTED if example has been
+        recorded, else None.
+        """
+        return self.results.get(HashItAnyway(example))
+
+    def record(self, example, status):
+        assert status in (PASSED, FALSIFIED, REJECTED)
+        self.results[HashItAnyway(example)] = status
@@ -0,0 +1,208 @@
+"""
+List and dict like values whose elements are only generated when they are
+first looked at, for hypotheses which often reject an example after looking
+at a small part of it.
+
+Each lazy value keeps the seed of the random number generator its elements
+are drawn from, so it can always be generated again from scratch: Copying
+one gives a new lazy value with nothing generated yet, and realising one
+gives the ordinary list or dict with exactly the elements it would have had
+whatever was done to it in the meantime.
+"""
+
+from random import Random
+
+from hypothesis.internal.compat import (
+    Mapping, MutableMapping, MutableSequence, xrange
+)
+
+
+class LazyList(MutableSequence):
+    """
+    A list of size elements drawn from strategy with parameter, each within
+    budget. Elements are
+    generated in chunks, each twice the size of everything generated before
+    it, so that looking at the first few elements is cheap but the whole
+    list is generated in a logarithmic number of calls to produce_many.
+
+    The first change made to the list generates all of it, after which it
+    behaves as an ordinary list.
+    """
+
+    def __init__(self, strategy, parameter, seed, size, budget):
+        self.strategy = strategy
+        self.parameter = parameter
+        self.seed = seed
+        self.size = size
+        self.budget = budget
+        self.random = Random(seed)
+        self.elements = []
+        self.complete = False
+
+    def fresh(self):
+        return LazyList(
+            self.strategy, self.parameter, self.seed, self.size, self.budget)
+
+    def realise(self):
+        return self.fresh().generated(self.size)
+
+    def generated(self, n):
+        """
+        Returns the list of elements generated so far, having made sure it
+        has at least n of them if the list is that long.
+        """
+        if self.complete:
+            return self.elements
+        n = min(n, self.size)
+        while len(self.elements) < n:
+            chunk = min(max(1, len(self.elements)), self.size - len(
+                self.elements))
+            self.elements.extend(self.strategy.produce_many_within(
+                self.random, self.parameter, chunk, self.budget))
+        return self.elements
+
+    def everything(self):
+        """All the elements, ready to be changed."""
+        elements = self.generated(self.size)
+        self.complete = True
+        return elements
+
+    def __len__(self):
+        if self.complete:
+            return len(self.elements)
+        return self.size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            indices = xrange(*i.indices(len(self)))
+            if not indices:
+                return []
+            elements = self.generated(max(indices[0], indices[-1]) + 1)
+            return [elements[j] for j in indices]
+        if i < 0:
+            i += len(self)
+        if not (0 <= i < len(self)):
+            raise IndexError('list index out of range')
+        return self.generated(i + 1)[i]
+
+    def __iter__(self):
+        i = 0
+        while i < len(self):
+            yield self.generated(i + 1)[i]
+            i += 1
+
+    def __setitem__(self, i, value):
+        self.everything()[i] = value
+
+    def __delitem__(self, i):
+        del self.everything()[i]
+
+    def insert(self, i, value):
+        self.everything().insert(i, value)
+
+    def sort(self, *args, **kwargs):
+        self.everything().sort(*args, **kwargs)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyList)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class LazyDict(MutableMapping):
+    """
+    A dict with the keys of strategies, a dict of strategies, in which the
+    value for each key is generated by its strategy with parameters[key],
+    within budget, the first time it is looked up. Each key has its own seed, so values can be
+    generated in any order.
+
+    The first change made to the dict generates all of it, after which it
+    behaves as an ordinary dict.
+    """
+
+    def __init__(self, strategies, parameters, seeds, budget):
+        self.strategies = strategies
+        self.parameters = parameters
+        self.seeds = seeds
+        self.budget = budget
+        self.values = {}
+        self.complete = False
+
+    def fresh(self):
+        return LazyDict(
+            self.strategies, self.parameters, self.seeds, self.budget)
+
+    def realise(self):
+        return dict(self.fresh().everything())
+
+    def generated(self, key):
+        try:
+            return self.values[key]
+        except KeyError:
+            pass
+        if self.complete or key not in self.seeds:
+            raise KeyError(key)
+        value = self.strategies[key].produce_within(
+            Random(self.seeds[key]), self.parameters[key], self.budget)
+        self.values[key] = value
+        return value
+
+    def everything(self):
+        """All the values, ready to be changed."""
+        if not self.complete:
+            for key in self.seeds:
+                self.generated(key)
+            self.complete = True
+        return self.values
+
+    def __len__(self):
+        if self.complete:
+            return len(self.values)
+        return len(self.seeds)
+
+    def __iter__(self):
+        if self.complete:
+            return iter(self.values)
+        return iter(self.seeds)
+
+    def __getitem__(self, key):
+        return self.generated(key)
+
+    def __setitem__(self, key, value):
+        self.everything()[key] = value
+
+    def __delitem__(self, key):
+        del self.everything()[key]
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
@@ -0,0 +1,68 @@
+import time
+
+try:
+    timer = time.perf_counter
+except AttributeError:  # pragma: no cover
+    timer = time.time
+
+PHASES = (
+    'draw', 'produce', 'could_have_produced', 'track', 'copy', 'test',
+    'shrink',
+)
+
+
+class Statistics(object):
+    """
+    Wall time and call counts for each phase of a call to falsify, so that
+    it is possible to tell how much of a slow test is spent in the test
+    itself and how much is overhead.
+
+    Phases are recorded by passing the time a phase started to record, which
+    returns the time it finished so that consecutive phases can be chained
+    without extra calls to the timer. The shrink phase includes the time
+    spent in the test during shrinking, which is also counted under test.
+    """
+
+    def __init__(self):
+        self.times = dict((phase, 0.0) for phase in PHASES)
+        self.calls = dict((phase, 0) for phase in PHASES)
+        self.duplicates_skipped = 0
+        self.assumptions_rejected = 0
+        self.shrinks_tried = 0
+        self.false_positive_rate = 0.0
+
+    def record_false_positive_rate(self, tracker):
+        """
+        Note the chance that tracker has skipped an example as a duplicate
+        when it was not.
+        """
+        self.false_positive_rate = max(
+            self.false_positive_rate, tracker.false_positive_rate())
+
+    def record(self, phase, started):
+        now = timer()
+        self.times[phase] += now - started
+        self.calls[phase] += 1
+        return now
+
+    def merge(self, other):
+        for phase in PHASES:
+            self.times[phase] += other.times[phase]
+            self.calls[phase] += other.calls[phase]
+        self.duplicates_skipped += other.duplicates_skipped
+        self.assumptions_rejected += other.assumptions_rejected
+        self.shrinks_tried += other.shrinks_tried
+        self.false_positive_rate = max(
+            self.false_positive_rate, other.false_positive_rate)
+
+    def __repr__(self):
+        return 'Statistics(%s, duplicates_skipped=%d, ' \
+            'assumptions_rejected=%d, shrinks_tried=%d)' % (
+                ', '.join(
+                    '%s=%d calls in %.3fs' % (
+                        phase, self.calls[phase], self.times[phase])
+                    for phase in PHASES
+                ),
+                self.duplicates_skipped, self.assumptions_rejected,
+                self.shrinks_tried,
+            )
@@ -1,4 +1,17 @@
-from hypothesis.internal.utils.hashitanyway import HashItAnyway
+from hypothesis.internal.utils.hashitanyway import HashItAnyway, ndarray
+from collections import OrderedDict
+import hashlib
+import math
+import struct
+
+EXACT = 'exact'
+FINGERPRINT = 'fingerprint'
+BLOOM = 'bloom'
+
+TRACKERS = (EXACT, FINGERPRINT, BLOOM)
+
+# The number of values a Bloom filter is sized for if no capacity is given
+DEFAULT_BLOOM_CAPACITY = 100000
 
 
 class Tracker(object):
@@ -11,3 +24,135 @@ class Tracker(object):
         n = self.contents.get(k, 0) + 1
         self.contents[k] = n
         return n
+
+    def false_positive_rate(self):
+        return 0.0
+
+
+def fingerprint(x):
+    """
+    A 16 byte digest of the structure of x. Sequences are digested in order,
+    sets and dicts regardless of order, and anything else by its type and
+    repr, so two values with the same fingerprint are almost certainly equal
+    unless they are of a type whose repr does not describe it fully.
+    """
+    hasher = hashlib.md5()
+    _feed(hasher, x)
+    return hasher.digest()
+
+
+def _feed(hasher, x):
+    hasher.update(type(x).__name__.encode('utf-8'))
+    if isinstance(x, (set, frozenset)):
+        hasher.update(b'{')
+        for f in sorted(fingerprint(y) for y in x):
+            hasher.update(f)
+        hasher.update(b'}')
+    elif isinstance(x, dict):
+        hasher.update(b'{')
+        for f in sorted(fingerprint(kv) for kv in x.items()):
+            hasher.update(f)
+        hasher.update(b'}')
+    elif ndarray is not None and isinstance(x, ndarray):
+        hasher.update(x.dtype.str.encode('ascii'))
+        hasher.update(repr(x.shape).encode('ascii'))
+        hasher.update(x.tobytes())
+    elif isinstance(x, (list, tuple)):
+        hasher.update(b'(')
+        for y in x:
+            _feed(hasher, y)
+            hasher.update(b',')
+        hasher.update(b')')
+    else:
+        hasher.update(b'<')
+        hasher.update(repr(x).encode('utf-8', 'backslashreplace'))
+        hasher.update(b'>')
+
+
+class FingerprintTracker(object):
+    """
+    A Tracker which keeps a fixed size fingerprint of each value rather than
+    the value itself. If capacity is not None only the most recent capacity
+    fingerprints are kept, so memory use is bounded at the cost of not
+    noticing repeats of values seen long ago.
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.contents = OrderedDict()
+
+    def track(self, x):
+        k = fingerprint(x)
+        n = self.contents.pop(k, 0) + 1
+        self.contents[k] = n
+        if self.capacity is not None and len(self.contents) > self.capacity:
+            self.contents.popitem(last=False)
+        return n
+
+    def false_positive_rate(self):
+        """
+        An upper bound on the probability that any two of the values tracked
+        so far have been mistaken for each other.
+        """
+        n = len(self.contents)
+        return min(1.0, n * (n - 1) / 2.0 ** 129)
+
+
+class BloomTracker(object):
+    """
+    A Tracker which uses a Bloom filter sized for capacity values with a
+    false positive rate of error_rate. It takes a fixed amount of memory no
+    matter how many values it sees, but can only report whether a value has
+    (probably) been seen before: track returns 2 for such values and 1 for
+    new ones.
+    """
+
+    def __init__(self, capacity, error_rate=1e-6):
+        if capacity < 1:
+            raise ValueError(
+                'Bloom filter capacity must be positive but got %r' % (
+                    capacity,))
+        self.bits = max(8, int(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(
+            float(self.bits) / capacity * math.log(2))))
+        self.filter = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def track(self, x):
+        h1, h2 = struct.unpack('<QQ', fingerprint(x))
+        seen = True
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % self.bits
+            byte = bit >> 3
+            mask = 1 << (bit & 7)
+            if not self.filter[byte] & mask:
+                seen = False
+                self.filter[byte] |= mask
+        if seen:
+            return 2
+        self.count += 1
+        return 1
+
+    def false_positive_rate(self):
+        """
+        The probability that the next new value will be mistaken for one that
+        has already been seen.
+        """
+        return (
+            1 - math.exp(-float(self.hashes) * self.count / self.bits)
+        ) ** self.hashes
+
+
+def tracker_for_settings(settings):
+    if settings.tracker == EXACT:
+        return Tracker()
+    elif settings.tracker == FINGERPRINT:
+        return FingerprintTracker(settings.tracker_capacity)
+    elif settings.tracker == BLOOM:
+        return BloomTracker(
+            settings.tracker_capacity or DEFAULT_BLOOM_CAPACITY)
+    else:
+        raise ValueError(
+            'Unknown tracker %r. Expected one of %s' % (
+                settings.tracker, ', '.join(TRACKERS)))
@@ -1,4 +1,16 @@
+import binascii
 import math
+from hypothesis.internal.compat import xrange
+
+try:
+    from numpy.random import Generator, PCG64
+except ImportError:
+    # Older versions of numpy only have RandomState, which is far too slow to
+    # seed for us to create one per batch.
+    Generator = None
+
+# Below this many values setting up a numpy generator costs more than it saves
+NUMPY_THRESHOLD = 64
 
 
 def geometric(random, p):
@@ -12,3 +24,87 @@ def geometric(random, p):
 
 def biased_coin(random, p):
     return random.random() <= p
+
+
+def random_bytes(random, n):
+    """n uniformly random bytes, taken from a single call for random bits."""
+    if n <= 0:
+        return b''
+    return binascii.unhexlify('%0*x' % (2 * n, random.getrandbits(8 * n)))
+
+
+def numpy_random(random, n):
+    """
+    Returns a numpy Generator seeded from random if numpy is available and it
+    is worth using for n values, else None. Seeding from random rather than
+    numpy's global state keeps bulk draws reproducible from the caller's seed.
+    """
+    if Generator is None or n < NUMPY_THRESHOLD:
+        return None
+    return Generator(PCG64(random.getrandbits(64)))
+
+
+def numpy_generator(random):
+    """
+    Returns a numpy random number generator seeded from random. This is for
+    strategies which only work with numpy installed.
+    """
+    if Generator is None:
+        from numpy.random import RandomState
+        return RandomState(random.getrandbits(32))
+    return Generator(PCG64(random.getrandbits(64)))
+
+
+def uniforms(random, n):
+    """n floats uniformly distributed in [0, 1)."""
+    rnd = numpy_random(random, n)
+    if rnd is not None:
+        return rnd.random(n).tolist()
+    r = random.random
+    return [r() for _ in xrange(n)]
+
+
+def geometrics(random, p, n):
+    """n independent values of geometric(random, p)."""
+    # numpy produces int64 values, which a very small p could overflow
+    rnd = numpy_random(random, n) if p >= 1e-12 else None
+    if rnd is not None:
+        return (rnd.geometric(p, n) - 1).tolist()
+    denom = math.log1p(-p)
+    log = math.log
+    r = random.random
+    return [int(log(r()) / denom) for _ in xrange(n)]
+
+
+def biased_coins(random, p, n):
+    """n independent values of biased_coin(random, p)."""
+    rnd = numpy_random(random, n)
+    if rnd is not None:
+        return (rnd.random(n) <= p).tolist()
+    r = random.random
+    return [r() <= p for _ in xrange(n)]
+
+
+def normals(random, mean, sd, n):
+    rnd = numpy_random(random, n)
+    if rnd is not None:
+        return rnd.normal(mean, sd, n).tolist()
+    r = random.normalvariate
+    return [r(mean, sd) for _ in xrange(n)]
+
+
+def exponentials(random, lambd, n):
+    rnd = numpy_random(random, n)
+    if rnd is not None:
+        return rnd.exponential(1.0 / lambd, n).tolist()
+    r = random.expovariate
+    return [r(lambd) for _ in xrange(n)]
+
+
+def indices(random, k, n):
+    """n independent integers drawn uniformly from [0, k)."""
+    rnd = numpy_random(random, n)
+    if rnd is not None:
+        return rnd.integers(0, k, n).tolist()
+    r = random.random
+    return [int(r() * k) for _ in xrange(n)]
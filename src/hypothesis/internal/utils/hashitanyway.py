@@ -1,16 +1,91 @@
+try:
+    from numpy import ndarray, array_equal
+except ImportError:
+    ndarray = None
+
+
 def hash_everything(l):
-    try:
-        return hash(l)
-    except TypeError:
-        h = hash(l.__class__)
+    """
+    A hash for l even if it is not hashable. Hashable values use their own
+    hash. Otherwise sets and dicts (including their values) are hashed
+    without regard to order and anything else iterable is hashed as the
+    sequence of the hashes of its elements, so that permutations and repeated
+    elements hash differently. Anything else hashes as its type.
+    """
+    return _hash_element(l, {})
+
+
+def _hash_unhashable(l, memo):
+    # memo maps the ids of the unhashable values seen so far to their hashes,
+    # so that a value which appears several times within the one being
+    # hashed (e.g. [x] * 10) is only hashed once. Iterating over some values
+    # creates new objects, so we keep hold of each value as well to stop its
+    # id being reused for a different one.
+    seen = memo.get(id(l))
+    if seen is not None:
+        return seen[1]
+    if ndarray is not None and isinstance(l, ndarray):
+        h = hash((l.__class__, l.dtype.str, l.shape, l.tobytes()))
+    elif isinstance(l, dict):
+        h = hash((l.__class__, frozenset(
+            (k, _hash_element(v, memo)) for k, v in l.items()
+        )))
+    elif isinstance(l, (set, frozenset)):
+        h = hash((l.__class__, frozenset(l)))
+    else:
         try:
             xs = iter(l)
         except TypeError:
-            return h
+            xs = None
+        if xs is None:
+            h = hash(l.__class__)
+        else:
+            h = hash((l.__class__, tuple([
+                _hash_element(x, memo) for x in xs
+            ])))
+    memo[id(l)] = (l, h)
+    return h
+
 
-        for x in xs:
-            h = h ^ hash_everything(x)
-        return h
+# Common types which are known to be unhashable, so we need not try
+UNHASHABLE_TYPES = frozenset((list, dict, set, bytearray))
+
+
+def _hash_element(x, memo):
+    if type(x) in UNHASHABLE_TYPES:
+        return _hash_unhashable(x, memo)
+    try:
+        return hash(x)
+    except TypeError:
+        return _hash_unhashable(x, memo)
+
+
+def equal_everything(x, y):
+    """
+    x == y, except that numpy arrays anywhere within x and y are equal if
+    they have the same dtype, shape and elements rather than comparing to an
+    array of booleans.
+    """
+    if ndarray is not None and (
+        isinstance(x, ndarray) or isinstance(y, ndarray)
+    ):
+        return (
+            isinstance(x, ndarray) and isinstance(y, ndarray) and
+            x.dtype == y.dtype and array_equal(x, y)
+        )
+    try:
+        return bool(x == y)
+    except ValueError:
+        # Raised by bool when x and y are collections containing arrays.
+        pass
+    if x.__class__ != y.__class__:
+        return False
+    if isinstance(x, dict):
+        return set(x) == set(y) and all(
+            equal_everything(v, y[k]) for k, v in x.items())
+    if len(x) != len(y):
+        return False
+    return all(equal_everything(u, v) for u, v in zip(x, y))
 
 
 class HashItAnyway(object):
@@ -23,7 +98,7 @@ class HashItAnyway(object):
         return (isinstance(other, HashItAnyway) and
                 self.wrapped.__class__ == other.wrapped.__class__ and
                 self.h == other.h and
-                self.wrapped == other.wrapped)
+                equal_everything(self.wrapped, other.wrapped))
 
     def __ne__(self, other):
         return not(self == other)
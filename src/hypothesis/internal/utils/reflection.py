@@ -4,7 +4,9 @@ really unreasonable lengths to produce pretty output.
 """
 
 import inspect
-from hypothesis.internal.compat import xrange, ARG_NAME_ATTRIBUTE
+from hypothesis.internal.compat import (
+    xrange, ARG_NAME_ATTRIBUTE, getargspec
+)
 import types
 import ast
 import re
@@ -26,7 +28,7 @@ def function_digest(function):
     except (OSError, IOError):
         pass
     hasher.update(function.__name__.encode('utf-8'))
-    hasher.update(repr(inspect.getargspec(function)).encode('utf-8'))
+    hasher.update(repr(getargspec(function)).encode('utf-8'))
     return hasher.digest()
 
 
@@ -36,7 +38,7 @@ def convert_keyword_arguments(function, args, kwargs):
     passed as positional and keyword args to the function. Unless function has
     **kwargs the dictionary will always be empty.
     """
-    argspec = inspect.getargspec(function)
+    argspec = getargspec(function)
     new_args = []
     kwargs = dict(kwargs)
 
@@ -114,7 +116,7 @@ def extract_lambda_source(f):
     This is not a good function and I am sorry for it. Forgive me my sins, oh
     lord
     """
-    args = inspect.getargspec(f).args
+    args = getargspec(f).args
     if_confused = "lambda %s: <unknown>" % (', '.join(args),)
     try:
         source = inspect.getsource(f)
@@ -0,0 +1,56 @@
+ALWAYS = 'always'
+SAMPLED = 'sampled'
+TRUSTED = 'trusted'
+
+POLICIES = (ALWAYS, SAMPLED, TRUSTED)
+
+
+class Validator(object):
+    """
+    Decides which of the values produced or simplified by a strategy get
+    checked against its could_have_produced, which for collections is a walk
+    over the whole value.
+
+    With the ALWAYS policy every value is checked. With SAMPLED only the first
+    of every interval values is. With TRUSTED values are never checked if the
+    strategy is_trusted, and always checked otherwise.
+    """
+
+    def __init__(self, strategy, policy=ALWAYS, interval=1):
+        if policy not in POLICIES:
+            raise ValueError(
+                'Unknown validation policy %r. Expected one of %s' % (
+                    policy, ', '.join(POLICIES)))
+        if interval < 1:
+            raise ValueError(
+                'Validation interval must be positive but got %r' % (
+                    interval,))
+        self.strategy = strategy
+        if policy == ALWAYS:
+            self.interval = 1
+        elif policy == SAMPLED:
+            self.interval = interval
+        elif strategy.is_trusted():
+            self.interval = 0
+        else:
+            self.interval = 1
+        self.seen = 0
+
+    @classmethod
+    def for_settings(cls, strategy, settings):
+        return cls(
+            strategy, settings.validation, settings.validation_interval)
+
+    def due(self):
+        """
+        Returns whether the next value should be checked.
+        """
+        if not self.interval:
+            return False
+        due = self.seen % self.interval == 0
+        self.seen += 1
+        return due
+
+    def validate(self, value):
+        if self.due():
+            assert self.strategy.could_have_produced(value)
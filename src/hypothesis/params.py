@@ -1,6 +1,8 @@
 import collections
 import hypothesis.internal.utils.distributions as dist
 import inspect
+import math
+from hypothesis.internal.compat import xrange
 
 
 class Parameter(object):
@@ -10,6 +12,14 @@ class Parameter(object):
     def draw(self, random):
         raise NotImplemented()  # pragma: no cover
 
+    def draw_expression(self, compiler, depth):
+        """
+        Source for an expression in random with the same value as
+        self.draw(random), for compile_draw. Parameters made out of others
+        override this to inline their children's expressions.
+        """
+        return '%s(random)' % (compiler.name(self.draw),)
+
 
 class ExponentialParameter(Parameter):
     def __init__(self, lambd):
@@ -77,16 +87,71 @@ class NonEmptySubset(Parameter):
         self.p = activation_chance
 
     def draw(self, random):
+        """
+        Each element is included independently with probability p,
+        conditioned on at least one being included. Rather than flipping a
+        coin per element this jumps straight from each included element to
+        the next, so takes time proportional to the number included.
+        """
         if len(self.elements) == 1:
             return self.elements[0]
+        n = len(self.elements)
+        if self.p >= 1:
+            return list(self.elements)
+        log_q = math.log1p(-self.p)
+        # The index of the first element included is geometric, conditioned
+        # on being less than n. This samples it by inverting its CDF.
+        i = min(n - 1, int(math.log1p(
+            -random.random() * -math.expm1(n * log_q)) / log_q))
         result = []
-        while not result:
-            result = [
-                x for x in self.elements if dist.biased_coin(random, self.p)
-            ]
+        while i < n:
+            result.append(self.elements[i])
+            i += 1 + dist.geometric(random, self.p)
         return result
 
 
+class IntervalSubset(Parameter):
+    """
+    Like NonEmptySubset(range(start, end + 1)) but without ever building the
+    range, so that drawing takes the same time and memory however large the
+    range is. A value is either a sub-interval, as an xrange, or a sorted
+    tuple of a few distinct points in the range. Both support len and
+    indexing.
+    """
+
+    def __init__(
+        self, start, end, interval_chance=0.5, expected_points=2.0
+    ):
+        Parameter.__init__(self)
+        if start > end:
+            raise ValueError("Invalid range [%d, %d]" % (start, end))
+        if not (0 <= interval_chance <= 1):
+            raise ValueError(
+                "Value %f out of valid range [0, 1]" % (interval_chance,))
+        if expected_points < 1:
+            raise ValueError(
+                "Expected number of points must be at least 1 but got %f" % (
+                    expected_points,))
+        self.start = start
+        self.end = end
+        self.interval_chance = interval_chance
+        self.expected_points = expected_points
+
+    def draw(self, random):
+        size = self.end - self.start + 1
+        if dist.biased_coin(random, self.interval_chance):
+            # Widths are log-uniform so that narrow and wide intervals are
+            # both common.
+            width = min(size, random.randint(
+                1, 1 << random.randint(0, size.bit_length())))
+            lower = self.start + random.randint(0, size - width)
+            return xrange(lower, lower + width)
+        n = 1 + dist.geometric(random, 1.0 / self.expected_points)
+        return tuple(sorted(set(
+            random.randint(self.start, self.end) for _ in xrange(n)
+        )))
+
+
 class BiasedCoin(Parameter):
     def __init__(self, p):
         Parameter.__init__(self)
@@ -98,16 +163,63 @@ class BiasedCoin(Parameter):
         return dist.biased_coin(random, self.p)
 
 
+# Composite parameters nested more deeply than this below the one being
+# compiled are drawn by calling their own compiled functions, as Python limits
+# how deeply an expression can nest.
+MAX_INLINE_DEPTH = 32
+
+
+class DrawCompiler(object):
+    """
+    Collects the objects that the source built by draw_expression refers to,
+    under the names it refers to them by.
+    """
+
+    def __init__(self):
+        self.namespace = {}
+
+    def name(self, value):
+        name = '_%d' % (len(self.namespace),)
+        self.namespace[name] = value
+        return name
+
+    def expression(self, parameter, depth):
+        if depth > MAX_INLINE_DEPTH:
+            return '%s(random)' % (self.name(parameter.draw),)
+        return parameter.draw_expression(self, depth)
+
+
+def compile_draw(parameter):
+    """
+    A function which draws from parameter in a single expression, with the
+    children of composite parameters inlined all the way down to the leaves
+    rather than each drawn by a method call which looks its children up and
+    loops over them. It consumes random exactly as parameter.draw does, so
+    returns the same value given a random in the same state.
+    """
+    compiler = DrawCompiler()
+    source = 'def draw(random):\n    return %s\n' % (
+        compiler.expression(parameter, 0),)
+    exec(source, compiler.namespace)
+    return compiler.namespace['draw']
+
+
 class DictParameter(Parameter):
     def __init__(self, dict_of_parameters):
         Parameter.__init__(self)
         self.dict_of_parameters = dict(dict_of_parameters)
+        self.compiled_draw = None
 
     def draw(self, random):
-        result = {}
-        for k, v in self.dict_of_parameters.items():
-            result[k] = v.draw(random)
-        return result
+        if self.compiled_draw is None:
+            self.compiled_draw = compile_draw(self)
+        return self.compiled_draw(random)
+
+    def draw_expression(self, compiler, depth):
+        return '{%s}' % (', '.join(
+            '%s: %s' % (compiler.name(k), compiler.expression(v, depth + 1))
+            for k, v in self.dict_of_parameters.items()
+        ),)
 
 
 class CompositeParameter(Parameter):
@@ -116,6 +228,7 @@ class CompositeParameter(Parameter):
         if not kwargs and len(args) == 1 and inspect.isgenerator(args[0]):
             args = tuple(args[0])
         is_pure_tuple = not kwargs
+        self.compiled_draw = None
         children = []
         for i, x in enumerate(args):
             name = "arg%d" % (i,)
@@ -137,10 +250,16 @@ class CompositeParameter(Parameter):
             self.Result = collections.namedtuple('Result', self.children)
 
     def draw(self, random):
-        bits = [
-            getattr(self, c).draw(random) for c in self.children
-        ]
+        if self.compiled_draw is None:
+            self.compiled_draw = compile_draw(self)
+        return self.compiled_draw(random)
+
+    def draw_expression(self, compiler, depth):
+        bits = ''.join(
+            compiler.expression(getattr(self, c), depth + 1) + ', '
+            for c in self.children
+        )
         if self.Result == tuple:
-            return tuple(bits)
+            return '(%s)' % (bits,)
         else:
-            return self.Result(*bits)
+            return '%s(%s)' % (compiler.name(self.Result), bits)
@@ -1,26 +1,26 @@
-from hypothesis.internal.tracker import Tracker
+from hypothesis.internal.tracker import Tracker, tracker_for_settings
+from hypothesis.internal.validation import Validator
+import hypothesis.settings as hs
 import hypothesis.params as params
 import hypothesis.internal.utils.distributions as dist
 
 import inspect
 from abc import abstractmethod
-from hypothesis.internal.compat import xrange
+from hypothesis.internal.compat import xrange, unichr, PY3
+import hypothesis.internal.charmap as charmap
+from hypothesis.internal.lazy import LazyList, LazyDict
 from hypothesis.internal.compat import text_type, binary_type, integer_types
 import string
+import sys
 import random as r
 import hypothesis.descriptors as descriptors
 from copy import deepcopy
+from itertools import islice
 
-
-def mix_generators(*generators):
-    generators = list(generators)
-    while generators:
-        for i in xrange(len(generators)):
-            try:
-                yield next(generators[i])
-            except StopIteration:
-                generators[i] = None
-        generators = [x for x in generators if x is not None]
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def nice_string(xs):
@@ -71,6 +71,9 @@ def nice_string(xs):
 
 class SearchStrategy(object):
     has_immutable_data = True
+    # Whether to_template and from_template are the identity, so that
+    # simplify works on values directly.
+    has_trivial_templates = True
 
     def __repr__(self):
         return '%s(%s)' % (
@@ -85,26 +88,134 @@ class SearchStrategy(object):
     def produce(self, random, parameter_value):
         pass  # pragma: no cover
 
+    def produce_many(self, random, parameter_value, n):
+        """
+        Produce a list of n values for the same parameter value. Strategies
+        which can draw their values in bulk override this to do so, and
+        collection strategies use it for their elements.
+        """
+        return [self.produce(random, parameter_value) for _ in xrange(n)]
+
+    def produce_within(self, random, parameter_value, budget):
+        """
+        Like produce, but keeping the size of the value to at most budget
+        where possible. The size of a value is the number of values from
+        strategies other than collections that it contains, so this only
+        makes a difference for collections, which share budget out among
+        their elements.
+        """
+        return self.produce(random, parameter_value)
+
+    def produce_many_within(self, random, parameter_value, n, budget):
+        """
+        Like produce_many, but keeping the size of each value to at most
+        budget where possible.
+        """
+        return self.produce_many(random, parameter_value, n)
+
+    def produce_lazily(self, random, parameter_value, budget):
+        """
+        Like produce_within, but may return a value parts of which are only
+        generated when they are first looked at. realise turns such a value
+        into an ordinary one.
+        """
+        return self.produce_within(random, parameter_value, budget)
+
+    def realise(self, value):
+        """
+        The ordinary value that value, returned by produce_lazily, stands
+        for, generating whatever parts of it have not been yet.
+        """
+        return value
+
+    def compile_produce(self):
+        """
+        A function of (random, parameter_value, budget) which does the same
+        as produce_within, consuming random in the same way, but with the
+        dispatch through this strategy's tree of children worked out in
+        advance. Strategies made out of others compile their children and
+        combine the results, so compiling the root specialises the whole
+        tree. Strategies whose produce_within has been overridden since are
+        left uncompiled.
+        """
+        if produces_like(self, SearchStrategy):
+            produce = self.produce
+            return lambda random, pv, budget: produce(random, pv)
+        return self.produce_within
+
+    def to_template(self, value):
+        """
+        The template for value, which this strategy produced. Templates are
+        what simplify works on, so that a strategy which builds its values
+        out of another strategy's can shrink without building a value for
+        every candidate. For most strategies they are just the values.
+        """
+        return value
+
+    def from_template(self, template):
+        """
+        The value that template, from to_template or simplify, stands for.
+        """
+        return template
+
+    def simplify_value(self, value):
+        """
+        Like simplify, but for a value rather than a template. This is for
+        strategies which simplify values of their children directly.
+        """
+        if self.has_trivial_templates:
+            return self.simplify(value)
+        return map(
+            self.from_template, self.simplify(self.to_template(value)))
+
     def copy(self, value):
+        """
+        A copy of value, which this strategy produced, that the test can
+        mutate without affecting value. Strategies whose values contain
+        mutable parts override this to rebuild just those parts rather than
+        deep copying everything.
+        """
         if self.has_immutable_data:
             return value
         else:
             return deepcopy(value)
 
-    def simplify(self, value):
+    def simplify(self, template):
         return iter(())
 
-    def simplify_such_that(self, t, f):
-        assert self.could_have_produced(t)
+    def simplify_such_that(self, t, f, settings=None):
+        settings = settings or hs.default
+        validator = Validator.for_settings(self, settings)
+        validator.validate(t)
         if not f(t):
             raise ValueError(
                 "%r does not satisfy predicate %s" % (t, f))
-        tracker = Tracker()
+        tracker = tracker_for_settings(settings)
+        if self.has_trivial_templates:
+            tracker.track(t)
+            yield t
+            for t in self.improve(t, f, validator, tracker):
+                yield t
+            return
+        values = TemplateValues(self, validator)
+        template = self.to_template(t)
+        tracker.track(template)
         yield t
+        for template in self.improve(
+            template, lambda s: f(values.value_for(s)), values, tracker
+        ):
+            yield values.value_for(template)
 
+    def improve(self, t, f, validator, tracker):
+        """
+        The search behind simplify_such_that: Yields successively simpler
+        values satisfying f, starting from t which is known to. Every value
+        considered should be passed to validator and skipped if tracker has
+        seen it before.
+        """
         while True:
             for s in self.simplify(t):
-                assert self.could_have_produced(s)
+                validator.validate(s)
                 if tracker.track(s) > 1:
                     continue
                 if f(s):
@@ -119,38 +230,220 @@ class SearchStrategy(object):
         c = d if inspect.isclass(d) else d.__class__
         return isinstance(x, c)
 
+    def cardinality(self):
+        """
+        An upper bound on the number of distinct values this strategy can
+        produce, or None if there is no useful one.
+        """
+        return None
+
+    def is_trusted(self):
+        """
+        Whether this is one of the strategies defined here, whose values are
+        known to pass could_have_produced, so that checking them can be
+        skipped. Strategies built from others override this to also require
+        their children to be trusted.
+        """
+        return type(self).__module__ == __name__
+
     def __or__(self, other):
         if not isinstance(other, SearchStrategy):
             raise ValueError("Cannot | a SearchStrategy with %r" % (other,))
         return one_of_strategies((self, other))
 
 
-class IntStrategy(SearchStrategy):
+class TemplateValues(object):
+    """
+    Builds the values of strategy's templates while improve works on them,
+    keeping the last one built so that the template improve has just
+    accepted need not be built again. It stands in for validator in improve,
+    but only checks a template's value when it is built, so that templates
+    tracker skips as duplicates are never built at all.
+    """
+
+    def __init__(self, strategy, validator):
+        self.strategy = strategy
+        self.validator = validator
+        self.pending = None
+        # Not any template, so the first value_for always builds a value
+        self.template = object()
+        self.value = None
+
+    def validate(self, template):
+        self.pending = template
+
+    def value_for(self, template):
+        if self.template is not template:
+            self.value = self.strategy.from_template(template)
+            self.template = template
+            if self.pending is template:
+                self.validator.validate(self.value)
+        return self.value
+
+
+# Ranks up to this are simplified by trying every smaller rank. Larger
+# ranks try this many of the ranks immediately below them.
+LINEAR_SIMPLIFICATION_LIMIT = 100
+LOCAL_SIMPLIFICATION_STEPS = 8
+
+
+# The budget of a value whose size is not limited
+UNLIMITED = float('inf')
+
+
+def share_budget(budget, n):
+    """
+    The budget for each of n parts of something with the given budget. Each
+    part gets at least 1, so that values which cannot be made smaller are
+    still produced.
+    """
+    if n <= 0:
+        return budget
+    return max(1, budget // n)
+
+
+def bisection_candidates(r):
+    """
+    Ranks simpler than r to try when simplifying something of rank r, where
+    rank 0 is the simplest: 0 first, then closing in on r by halving the
+    distance each time, then a few of the ranks just below r. For small
+    ranks every smaller rank is tried.
+    """
+    if r <= 0:
+        return
+    yield 0
+    seen = set()
+    k = r // 2
+    while k > 0:
+        seen.add(r - k)
+        yield r - k
+        k //= 2
+    if r <= LINEAR_SIMPLIFICATION_LIMIT:
+        lowest = 1
+    else:
+        lowest = r - LOCAL_SIMPLIFICATION_STEPS
+    for i in xrange(r - 1, lowest - 1, -1):
+        if i not in seen:
+            yield i
+
+
+def bisect_ranks(r, accept):
+    """
+    Binary search for the smallest rank at most r which accept accepts,
+    assuming that accept(r) is true and that if it accepts a rank it accepts
+    every larger one. Yields each accepted rank as it is found.
+    """
+    if r <= 0:
+        return
+    if accept(0):
+        yield 0
+        return
+    lo = 0
+    hi = r
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if accept(mid):
+            hi = mid
+            yield mid
+        else:
+            lo = mid
+
+
+def defining_class(cls, name):
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass
+
+
+def produces_like(strategy, cls):
+    """
+    Whether strategy produces its values with cls's produce_within, so that
+    cls's compile_produce can specialise it.
+    """
+    return (
+        'produce_within' not in strategy.__dict__ and
+        defining_class(type(strategy), 'produce_within') is cls
+    )
+
+
+class BisectingSearchStrategy(SearchStrategy):
+    """
+    A strategy for values which can be ordered by a rank, with 0 the
+    simplest, that it is worth shrinking by binary search. rank and unrank
+    convert between values and ranks.
+
+    simplify_such_that first does a binary search for the simplest rank that
+    satisfies the predicate, which takes a logarithmic number of calls if
+    the predicate is monotonic in rank, and then runs the usual search from
+    there to catch anything simpler when it is not.
+    """
+
+    def rank(self, x):
+        raise NotImplementedError()  # pragma: no cover
+
+    def unrank(self, r):
+        raise NotImplementedError()  # pragma: no cover
+
+    def simplify(self, x):
+        for r in bisection_candidates(self.rank(x)):
+            yield self.unrank(r)
+
+    def bisect(self, t, f):
+        for r in bisect_ranks(self.rank(t), lambda r: f(self.unrank(r))):
+            yield self.unrank(r)
+
+    def improve(self, t, f, validator, tracker):
+        # A subclass which changes how values are simplified should not have
+        # that bypassed by a binary search which knows nothing about it.
+        if issubclass(
+            defining_class(type(self), 'bisect'),
+            defining_class(type(self), 'simplify'),
+        ):
+            def accept(x):
+                validator.validate(x)
+                return tracker.track(x) == 1 and f(x)
+
+            for t in self.bisect(t, accept):
+                yield t
+        for t in super(BisectingSearchStrategy, self).improve(
+            t, f, validator, tracker
+        ):
+            yield t
+
+
+class IntStrategy(BisectingSearchStrategy):
+    """
+    Ints are simplified towards zero, with positive ints simpler than
+    negative ones of the same magnitude. The sign is simplified before the
+    magnitude, so ranks are magnitudes.
+    """
     descriptor = int
 
     def could_have_produced(self, x):
         return isinstance(x, integer_types)
 
+    def rank(self, x):
+        return abs(x)
+
+    def unrank(self, r):
+        return r
+
     def simplify(self, x):
         if x < 0:
             yield -x
-            for y in self.simplify(-x):
+            for y in super(IntStrategy, self).simplify(-x):
                 yield -y
-        elif x > 0:
-            yield 0
-            yield x // 2
-            max_iters = 100
-            if x <= max_iters:
-                for i in xrange(x - 1, 0, -1):
-                    yield i
-            else:
-                random = r.Random(x)
-                seen = {0, x // 2}
-                for _ in xrange(max_iters):
-                    i = random.randint(0, x - 1)
-                    if i not in seen:
-                        yield i
-                    seen.add(i)
+        else:
+            for y in super(IntStrategy, self).simplify(x):
+                yield y
+
+    def bisect(self, t, f):
+        if t < 0 and f(-t):
+            t = -t
+            yield t
+        sign = -1 if t < 0 else 1
+        for r in bisect_ranks(abs(t), lambda r: f(sign * r)):
+            yield sign * r
 
 
 class RandomGeometricIntStrategy(IntStrategy):
@@ -167,36 +460,66 @@ class RandomGeometricIntStrategy(IntStrategy):
             value = -value
         return value
 
+    def produce_many(self, random, parameter, n):
+        return [
+            -v if negative else v
+            for v, negative in zip(
+                dist.geometrics(random, parameter.p, n),
+                dist.biased_coins(random, parameter.negative_probability, n),
+            )
+        ]
+
 
-class BoundedIntStrategy(SearchStrategy):
+class BoundedIntStrategy(BisectingSearchStrategy):
+    """
+    Ints in the range [start, end]. Values in the lower half of the range
+    are simpler the closer they are to start, values in the upper half are
+    simpler the closer they are to end, and every value in the lower half is
+    simpler than any in the upper half.
+    """
     descriptor = int
     parameter = params.CompositeParameter()
 
+    # Ranges larger than this draw from an IntervalSubset rather than
+    # listing every value in the range.
+    MAX_SUBSET_SIZE = 100
+
     def __init__(self, start, end):
         self.start = start
         self.end = end
         if start > end:
             raise ValueError("Invalid range [%d, %d]" % (start, end))
-        self.parameter = params.NonEmptySubset(
-            tuple(range(start, end + 1)),
-            activation_chance=min(0.5, 3.0 / (end - start + 1))
-        )
+        if end - start < self.MAX_SUBSET_SIZE:
+            self.parameter = params.NonEmptySubset(
+                tuple(range(start, end + 1)),
+                activation_chance=min(0.5, 3.0 / (end - start + 1))
+            )
+        else:
+            self.parameter = params.IntervalSubset(start, end)
+        self.lower_size = (start + end) // 2 - start + 1
 
     def produce(self, random, parameter):
         if self.start == self.end:
             return self.start
         return random.choice(parameter)
 
-    def simplify(self, x):
-        if x == self.start:
-            return
-        for t in xrange(x - 1, self.start - 1, -1):
-            yield t
-        mid = (self.start + self.end) // 2
-        if x > mid:
-            yield self.start + (self.end - x)
-            for t in xrange(x + 1, self.end + 1):
-                yield t
+    def produce_many(self, random, parameter, n):
+        if self.start == self.end:
+            return [self.start] * n
+        return [parameter[i] for i in dist.indices(random, len(parameter), n)]
+
+    def cardinality(self):
+        return self.end - self.start + 1
+
+    def rank(self, x):
+        if x - self.start < self.lower_size:
+            return x - self.start
+        return self.lower_size + (self.end - x)
+
+    def unrank(self, r):
+        if r < self.lower_size:
+            return self.start + r
+        return self.end - (r - self.lower_size)
 
 
 class FloatStrategy(SearchStrategy):
@@ -239,6 +562,16 @@ class FixedBoundedFloatStrategy(SearchStrategy):
             right = self.upper_bound
         return left + random.random() * (right - left)
 
+    def produce_many(self, random, pv, n):
+        if pv.leftwards:
+            left = self.lower_bound
+            right = pv.cut
+        else:
+            left = pv.cut
+            right = self.upper_bound
+        width = right - left
+        return [left + u * width for u in dist.uniforms(random, n)]
+
     def simplify(self, value):
         yield self.lower_bound
         yield self.upper_bound
@@ -260,6 +593,12 @@ class BoundedFloatStrategy(FloatStrategy):
             random,  pv.spread
         ) * pv.length
 
+    def produce_many(self, random, pv, n):
+        return [
+            pv.left + x * pv.length
+            for x in self.inner_strategy.produce_many(random, pv.spread, n)
+        ]
+
 
 class GaussianFloatStrategy(FloatStrategy):
     parameter = params.CompositeParameter(
@@ -269,6 +608,9 @@ class GaussianFloatStrategy(FloatStrategy):
     def produce(self, random, pv):
         return random.normalvariate(pv.mean, 1)
 
+    def produce_many(self, random, pv, n):
+        return dist.normals(random, pv.mean, 1, n)
+
 
 class ExponentialFloatStrategy(FloatStrategy):
     parameter = params.CompositeParameter(
@@ -283,6 +625,13 @@ class ExponentialFloatStrategy(FloatStrategy):
             value = -value
         return pv.zero_point + value
 
+    def produce_many(self, random, pv, n):
+        values = dist.exponentials(random, pv.lambd, n)
+        if pv.negative:
+            return [pv.zero_point - v for v in values]
+        else:
+            return [pv.zero_point + v for v in values]
+
 
 class BoolStrategy(SearchStrategy):
     descriptor = bool
@@ -292,6 +641,12 @@ class BoolStrategy(SearchStrategy):
     def produce(self, random, p):
         return dist.biased_coin(random, p)
 
+    def produce_many(self, random, p, n):
+        return dist.biased_coins(random, p, n)
+
+    def cardinality(self):
+        return 2
+
 
 class TupleStrategy(SearchStrategy):
 
@@ -306,6 +661,33 @@ class TupleStrategy(SearchStrategy):
             x.parameter for x in self.element_strategies
         )
         self.has_immutable_data = all(s.has_immutable_data for s in strategies)
+        self.has_trivial_templates = all(
+            s.has_trivial_templates for s in strategies)
+
+    def is_trusted(self):
+        return super(TupleStrategy, self).is_trusted() and all(
+            s.is_trusted() for s in self.element_strategies)
+
+    def to_template(self, xs):
+        if self.has_trivial_templates:
+            return xs
+        return self.newtuple(
+            s.to_template(x) for s, x in zip(self.element_strategies, xs))
+
+    def from_template(self, xs):
+        if self.has_trivial_templates:
+            return xs
+        return self.newtuple(
+            s.from_template(x) for s, x in zip(self.element_strategies, xs))
+
+    def cardinality(self):
+        result = 1
+        for s in self.element_strategies:
+            c = s.cardinality()
+            if c is None:
+                return None
+            result *= c
+        return result
 
     def could_have_produced(self, xs):
         if xs.__class__ != self.tuple_type:
@@ -315,6 +697,22 @@ class TupleStrategy(SearchStrategy):
         return all((s.could_have_produced(x)
                     for s, x in zip(self.element_strategies, xs)))
 
+    def copy(self, xs):
+        if self.has_immutable_data:
+            return xs
+        return self.newtuple(
+            s.copy(x) for s, x in zip(self.element_strategies, xs))
+
+    def produce_lazily(self, random, pv, budget):
+        budget = share_budget(budget, len(self.element_strategies))
+        return self.newtuple(
+            g.produce_lazily(random, v, budget)
+            for g, v in zip(self.element_strategies, pv))
+
+    def realise(self, xs):
+        return self.newtuple(
+            s.realise(x) for s, x in zip(self.element_strategies, xs))
+
     def newtuple(self, xs):
         if self.tuple_type == tuple:
             return tuple(xs)
@@ -322,18 +720,66 @@ class TupleStrategy(SearchStrategy):
             return self.tuple_type(*xs)
 
     def produce(self, random, pv):
+        return self.produce_within(random, pv, UNLIMITED)
+
+    def produce_many(self, random, pv, n):
+        return self.produce_many_within(random, pv, n, UNLIMITED)
+
+    def produce_within(self, random, pv, budget):
         es = self.element_strategies
+        budget = share_budget(budget, len(es))
         return self.newtuple([
-            g.produce(random, v)
+            g.produce_within(random, v, budget)
             for g, v in zip(es, pv)
         ])
 
+    def compile_produce(self):
+        """
+        Generates the source of a function which produces each element with
+        its own compiled function, so that there is no loop or zip over the
+        elements at all.
+        """
+        if not produces_like(self, TupleStrategy):
+            return self.produce_within
+        namespace = {'share_budget': share_budget}
+        elements = []
+        for i, s in enumerate(self.element_strategies):
+            namespace['produce%d' % (i,)] = s.compile_produce()
+            elements.append('produce%d(random, pv[%d], budget), ' % (i, i))
+        if self.tuple_type == tuple:
+            result = '(%s)' % (''.join(elements),)
+        else:
+            namespace['tuple_type'] = self.tuple_type
+            result = 'tuple_type(%s)' % (''.join(elements),)
+        source = (
+            'def produce_within(random, pv, budget):\n'
+            '    budget = share_budget(budget, %d)\n'
+            '    return %s\n'
+        ) % (len(elements), result)
+        exec(source, namespace)
+        return namespace['produce_within']
+
+    def produce_many_within(self, random, pv, n, budget):
+        budget = share_budget(budget, len(self.element_strategies))
+        columns = [
+            g.produce_many_within(random, v, n, budget)
+            for g, v in zip(self.element_strategies, pv)
+        ]
+        if not columns:
+            return [self.newtuple(())] * n
+        return [self.newtuple(row) for row in zip(*columns)]
+
+    # The most candidates which change two positions at once that we will
+    # try in any one round of simplification.
+    MAX_PAIRWISE = 100
+
     def simplify(self, x):
         """
         Defined simplification for tuples: We don't change the length of the
         tuple we only try to simplify individual elements of it.
-        We first try simplifying each index. We then try pairs of indices.
-        After that we stop because it's getting silly.
+        We first try simplifying each index. We then try a bounded number of
+        simplifications of pairs of indices. After that we stop because it's
+        getting silly.
         """
 
         for i in xrange(0, len(x)):
@@ -341,8 +787,15 @@ class TupleStrategy(SearchStrategy):
                 z = list(x)
                 z[i] = s
                 yield self.newtuple(z)
-        for i in xrange(0, len(x)):
-            for j in xrange(0, len(x)):
+        for z in islice(self.pairwise_simplifications(
+            x, xrange(len(x))
+        ), self.MAX_PAIRWISE):
+            yield z
+
+    def pairwise_simplifications(self, x, positions):
+        positions = list(positions)
+        for i in positions:
+            for j in positions:
                 if i == j:
                     continue
                 for s in self.element_strategies[i].simplify(x[i]):
@@ -352,6 +805,66 @@ class TupleStrategy(SearchStrategy):
                         z[j] = t
                         yield self.newtuple(z)
 
+    def improve(self, t, f, validator, tracker):
+        """
+        Adaptive version of SearchStrategy.improve. Positions whose
+        simplifications have worked before are tried first, and a position
+        none of whose simplifications worked is skipped until no other
+        position can make progress. Only then are pairs of positions
+        simplified together, starting with the most successful positions and
+        trying at most MAX_PAIRWISE candidates each time.
+        """
+        def accept(candidate):
+            validator.validate(candidate)
+            return tracker.track(candidate) == 1 and f(candidate)
+
+        successes = [0] * len(t)
+        improvements = 0
+        # Maps positions none of whose simplifications worked to the number
+        # of improvements that had been made when we found that out.
+        exhausted = {}
+        while True:
+            order = sorted(xrange(len(t)), key=lambda i: -successes[i])
+            improved = False
+            for i in order:
+                if i in exhausted:
+                    continue
+                for s in self.element_strategies[i].simplify(t[i]):
+                    z = list(t)
+                    z[i] = s
+                    z = self.newtuple(z)
+                    if accept(z):
+                        t = z
+                        successes[i] += 1
+                        improved = True
+                        break
+                else:
+                    exhausted[i] = improvements
+                if improved:
+                    break
+            if not improved:
+                # Simplifying one position may make simplifications of another
+                # work that did not before, so positions are given another go
+                # if anything has changed since they were exhausted.
+                stale = [
+                    i for i, n in exhausted.items() if n < improvements]
+                if stale:
+                    for i in stale:
+                        del exhausted[i]
+                    continue
+                for z in islice(
+                    self.pairwise_simplifications(t, order),
+                    self.MAX_PAIRWISE
+                ):
+                    if accept(z):
+                        t = z
+                        improved = True
+                        break
+                if not improved:
+                    break
+            improvements += 1
+            yield t
+
 
 def one_of_strategies(xs):
     xs = tuple(xs)
@@ -384,58 +897,129 @@ class ListStrategy(SearchStrategy):
             average_length=params.ExponentialParameter(1.0 / average_length),
             child_parameter=self.element_strategy.parameter,
         )
+        self.has_trivial_templates = (
+            self.element_strategy.has_trivial_templates)
+
+    def to_template(self, value):
+        if self.has_trivial_templates:
+            return value
+        return [self.element_strategy.to_template(x) for x in value]
+
+    def from_template(self, template):
+        if self.has_trivial_templates:
+            return template
+        return [self.element_strategy.from_template(x) for x in template]
 
     def produce(self, random, pv):
-        length = dist.geometric(random, 1.0 / (1 + pv.average_length))
+        return self.produce_within(random, pv, UNLIMITED)
+
+    def produce_many(self, random, pv, n):
+        return self.produce_many_within(random, pv, n, UNLIMITED)
+
+    def produce_within(self, random, pv, budget):
+        length = min(budget, dist.geometric(
+            random, 1.0 / (1 + pv.average_length)))
+        return self.element_strategy.produce_many_within(
+            random, pv.child_parameter, length, share_budget(budget, length))
+
+    def compile_produce(self):
+        if not produces_like(self, ListStrategy):
+            return self.produce_within
+        produce_many = self.element_strategy.produce_many_within
+        geometric = dist.geometric
+
+        def produce_within(random, pv, budget):
+            length = min(budget, geometric(
+                random, 1.0 / (1 + pv.average_length)))
+            return produce_many(
+                random, pv.child_parameter, length,
+                share_budget(budget, length))
+        return produce_within
+
+    def produce_many_within(self, random, pv, n, budget):
+        lengths = [
+            min(budget, length) for length in
+            dist.geometrics(random, 1.0 / (1 + pv.average_length), n)
+        ]
+        # Every element gets the budget of an element of the longest list,
+        # so that they can all be produced together.
+        elements = self.element_strategy.produce_many_within(
+            random, pv.child_parameter, sum(lengths),
+            share_budget(budget, max(lengths) if lengths else 0))
         result = []
-        for _ in xrange(length):
-            result.append(
-                self.element_strategy.produce(random, pv.child_parameter))
+        i = 0
+        for length in lengths:
+            result.append(elements[i:i + length])
+            i += length
         return result
 
     def simplify(self, x):
+        """
+        Simplification in the style of delta debugging: We try the empty
+        list, then cutting successively smaller pieces off the end, then
+        deleting successively smaller chunks from anywhere, and only then
+        simplifying individual elements. Whenever a deletion succeeds the
+        shrinker starts again from the top, so the list roughly halves with
+        each success and a long list shrinks in a logarithmic number of steps
+        rather than by deleting one or two elements at a time. Candidates
+        which the different ways of deleting elements have in common are only
+        yielded once.
+        """
         if not x:
-            return iter(())
-        generators = []
-
-        generators.append(iter(([],)))
-
-        indices = xrange(len(x) - 1, -1, -1)
-
-        generators.append(
-            [x[i]] for i in indices
-        )
-
-        def with_one_index_deleted():
-            for i in indices:
-                y = list(x)
-                del y[i]
+            return
+        t = Tracker()
+        t.track(x)
+        for y in self.simplify_candidates(x):
+            if t.track(y) == 1:
                 yield y
 
-        def with_one_index_simplified():
-            for i in indices:
-                for s in self.element_strategy.simplify(x[i]):
-                    z = list(x)
-                    z[i] = s
-                    yield z
+    def simplify_candidates(self, x):
+        yield []
 
-        if len(x) > 2:
-            generators.append(with_one_index_deleted())
+        n = len(x)
+        k = n // 2
+        while k > 0:
+            yield x[:n - k]
+            k //= 2
 
-        generators.append(with_one_index_simplified())
-
-        def with_two_indices_deleted():
-            for i in xrange(0, len(x) - 1):
-                for j in xrange(i, len(x) - 1):
-                    y = list(x)
-                    del y[i]
-                    del y[j]
-                    yield y
+        chunk_size = max(1, n // 2)
+        while True:
+            for start in xrange(0, n, chunk_size):
+                yield x[:start] + x[start + chunk_size:]
+            if chunk_size == 1:
+                break
+            chunk_size //= 2
 
-        if len(x) > 3:
-            generators.append(with_two_indices_deleted())
+        for i in xrange(n - 1, -1, -1):
+            for s in self.element_strategy.simplify(x[i]):
+                z = list(x)
+                z[i] = s
+                yield z
+
+    def produce_lazily(self, random, pv, budget):
+        length = min(budget, dist.geometric(
+            random, 1.0 / (1 + pv.average_length)))
+        return LazyList(
+            self.element_strategy, pv.child_parameter,
+            random.getrandbits(64), length, share_budget(budget, length))
+
+    def realise(self, value):
+        if isinstance(value, LazyList):
+            return value.realise()
+        return value
 
-        return mix_generators(*generators)
+    def copy(self, value):
+        if isinstance(value, LazyList):
+            return value.fresh()
+        if self.element_strategy.has_immutable_data:
+            return list(value)
+        return [self.element_strategy.copy(x) for x in value]
+
+    def is_trusted(self):
+        return (
+            super(ListStrategy, self).is_trusted() and
+            self.element_strategy.is_trusted()
+        )
 
     def could_have_produced(self, value):
         return isinstance(value, list) and all(
@@ -445,6 +1029,13 @@ class ListStrategy(SearchStrategy):
 
 
 class MappedSearchStrategy(SearchStrategy):
+    """
+    Values built by pack from values of strategy, and taken apart by unpack.
+    The templates are those of strategy, so shrinking never unpacks and only
+    packs the candidates that get tested.
+    """
+    has_trivial_templates = False
+
     def __init__(self, descriptor, strategy):
         SearchStrategy.__init__(self)
         self.mapped_strategy = strategy
@@ -473,6 +1064,31 @@ class MappedSearchStrategy(SearchStrategy):
     def produce(self, random, pv):
         return self.pack(self.mapped_strategy.produce(random, pv))
 
+    def produce_many(self, random, pv, n):
+        return list(map(
+            self.pack, self.mapped_strategy.produce_many(random, pv, n)))
+
+    def produce_within(self, random, pv, budget):
+        return self.pack(
+            self.mapped_strategy.produce_within(random, pv, budget))
+
+    def produce_many_within(self, random, pv, n, budget):
+        return list(map(self.pack, self.mapped_strategy.produce_many_within(
+            random, pv, n, budget)))
+
+    def compile_produce(self):
+        if not produces_like(self, MappedSearchStrategy):
+            return self.produce_within
+        produce = self.mapped_strategy.compile_produce()
+        pack = self.pack
+        return lambda random, pv, budget: pack(produce(random, pv, budget))
+
+    def is_trusted(self):
+        return (
+            super(MappedSearchStrategy, self).is_trusted() and
+            self.mapped_strategy.is_trusted()
+        )
+
     def could_have_produced(self, value):
         return super(MappedSearchStrategy, self).could_have_produced(
             value
@@ -480,10 +1096,14 @@ class MappedSearchStrategy(SearchStrategy):
             self.unpack(value)
         )
 
-    def simplify(self, x):
-        unpacked = self.unpack(x)
-        for y in self.mapped_strategy.simplify(unpacked):
-            yield self.pack(y)
+    def to_template(self, value):
+        return self.mapped_strategy.to_template(self.unpack(value))
+
+    def from_template(self, template):
+        return self.pack(self.mapped_strategy.from_template(template))
+
+    def simplify(self, template):
+        return self.mapped_strategy.simplify(template)
 
 
 class ComplexStrategy(SearchStrategy):
@@ -514,37 +1134,117 @@ class ComplexStrategy(SearchStrategy):
             yield complex(x.real, t)
 
 
-class SetStrategy(MappedSearchStrategy):
-    has_immutable_data = False
+class BaseSetStrategy(SearchStrategy):
+    """
+    Sets of distinct values from the element strategy of list_strategy,
+    drawn directly rather than by collapsing a list. If the element strategy
+    knows its cardinality, sizes are scaled to it so that sets from a small
+    domain are not almost always full. Drawing stops early if the elements
+    keep coming out as ones already in the set.
+    """
+    set_type = set
 
     def __init__(self, list_strategy):
-        super(SetStrategy, self).__init__(
-            strategy=list_strategy,
-            descriptor=set(list_strategy.descriptor)
+        SearchStrategy.__init__(self)
+        self.element_strategy = list_strategy.element_strategy
+        self.parameter = list_strategy.parameter
+        self.descriptor = self.set_type(list_strategy.descriptor)
+        self.max_size = self.element_strategy.cardinality()
+
+    def is_trusted(self):
+        return (
+            super(BaseSetStrategy, self).is_trusted() and
+            self.element_strategy.is_trusted()
         )
 
-    def pack(self, x):
-        return set(x)
+    def could_have_produced(self, value):
+        return isinstance(value, self.set_type) and all(
+            self.element_strategy.could_have_produced(x) for x in value
+        )
 
-    def unpack(self, x):
-        return list(x)
+    def produce(self, random, pv):
+        return self.produce_within(random, pv, UNLIMITED)
+
+    def produce_within(self, random, pv, budget):
+        average_length = pv.average_length
+        size = budget
+        if self.max_size is not None:
+            average_length = min(average_length, self.max_size / 2.0)
+            size = min(size, self.max_size)
+        size = min(size, dist.geometric(random, 1.0 / (1 + average_length)))
+        element_budget = share_budget(budget, size)
+        result = set()
+        repeats = 0
+        while len(result) < size and repeats < max(10, size):
+            for x in self.element_strategy.produce_many_within(
+                random, pv.child_parameter, size - len(result),
+                element_budget
+            ):
+                if x in result:
+                    repeats += 1
+                else:
+                    result.add(x)
+        return self.set_type(result)
+
+    def produce_many_within(self, random, pv, n, budget):
+        return [self.produce_within(random, pv, budget) for _ in xrange(n)]
 
+    def simplify(self, x):
+        """
+        The set equivalent of ListStrategy.simplify: The empty set, then
+        sets with successively smaller chunks of x removed, then sets with
+        one element simplified.
+        """
+        if not x:
+            return
+        seen = set((frozenset(x),))
+        for y in self.simplify_candidates(x):
+            k = frozenset(y)
+            if k not in seen:
+                seen.add(k)
+                yield self.set_type(y)
+
+    def simplify_candidates(self, x):
+        yield ()
+
+        xs = list(x)
+        n = len(xs)
+        chunk_size = max(1, n // 2)
+        while True:
+            for start in xrange(0, n, chunk_size):
+                yield x.difference(xs[start:start + chunk_size])
+            if chunk_size == 1:
+                break
+            chunk_size //= 2
 
-class FrozenSetStrategy(MappedSearchStrategy):
-    def __init__(self, list_strategy):
-        super(FrozenSetStrategy, self).__init__(
-            strategy=list_strategy,
-            descriptor=frozenset(list_strategy.descriptor)
-        )
-        self.has_immutable_data = (
-            list_strategy.element_strategy.has_immutable_data
-        )
+        for e in xs:
+            for s in self.element_strategy.simplify_value(e):
+                y = set(x)
+                y.discard(e)
+                y.add(s)
+                yield y
 
-    def pack(self, x):
-        return frozenset(x)
 
-    def unpack(self, x):
-        return list(x)
+class SetStrategy(BaseSetStrategy):
+    has_immutable_data = False
+
+    def copy(self, x):
+        if self.element_strategy.has_immutable_data:
+            return set(x)
+        return set(self.element_strategy.copy(y) for y in x)
+
+
+class FrozenSetStrategy(BaseSetStrategy):
+    set_type = frozenset
+
+    def __init__(self, list_strategy):
+        super(FrozenSetStrategy, self).__init__(list_strategy)
+        self.has_immutable_data = self.element_strategy.has_immutable_data
+
+    def copy(self, x):
+        if self.has_immutable_data:
+            return x
+        return frozenset(self.element_strategy.copy(y) for y in x)
 
 
 class OneCharStringStrategy(SearchStrategy):
@@ -563,11 +1263,67 @@ class OneCharStringStrategy(SearchStrategy):
     def produce(self, random, pv):
         return random.choice(self.characters)
 
+    def cardinality(self):
+        return len(self.characters)
+
     def simplify(self, x):
         for i in xrange(self.characters.index(x), -1, -1):
             yield self.characters[i]
 
 
+class UnicodeCharStrategy(BisectingSearchStrategy):
+    """
+    Single characters from the given unicode general categories (any but
+    surrogates if categories is None) with codepoints between min_codepoint
+    and max_codepoint. The characters are kept as intervals of codepoints
+    rather than listed, so this works for the whole of unicode.
+
+    Characters are simplified towards '0' if it is allowed, with
+    simplicity increasing codepoint from there and wrapping around to the
+    characters before it. Otherwise the lowest codepoint is simplest.
+    """
+    descriptor = text_type
+
+    def __init__(
+        self, categories=None, min_codepoint=0, max_codepoint=sys.maxunicode
+    ):
+        SearchStrategy.__init__(self)
+        self.intervals = charmap.query(
+            categories, min_codepoint, max_codepoint)
+        if not self.intervals:
+            raise ValueError(
+                'No characters in categories %r between %d and %d' % (
+                    categories, min_codepoint, max_codepoint))
+        if ord('0') in self.intervals:
+            self.zero = self.intervals.index(ord('0'))
+        else:
+            self.zero = 0
+        self.parameter = params.IntervalSubset(0, len(self.intervals) - 1)
+
+    def could_have_produced(self, x):
+        return (
+            isinstance(x, text_type) and len(x) == 1 and
+            ord(x) in self.intervals
+        )
+
+    def cardinality(self):
+        return len(self.intervals)
+
+    def produce(self, random, pv):
+        return self.unrank(random.choice(pv))
+
+    def produce_many(self, random, pv, n):
+        return [self.unrank(pv[i]) for i in dist.indices(random, len(pv), n)]
+
+    def rank(self, x):
+        return (self.intervals.index(ord(x)) - self.zero) % len(
+            self.intervals)
+
+    def unrank(self, r):
+        return unichr(self.intervals[
+            (r + self.zero) % len(self.intervals)])
+
+
 class StringStrategy(MappedSearchStrategy):
     def __init__(self, list_of_one_char_strings_strategy):
         return super(StringStrategy, self).__init__(
@@ -590,6 +1346,166 @@ class BinaryStringStrategy(MappedSearchStrategy):
         return list(bytearray(x))
 
 
+class StringLikeStrategy(SearchStrategy):
+    """
+    Common simplification for text and bytes, which are simplified the way
+    ListStrategy simplifies lists but by slicing the value directly rather
+    than going via a list of its elements.
+    """
+
+    def __init__(self, element_strategy, average_length=100.0):
+        SearchStrategy.__init__(self)
+        self.element_strategy = element_strategy
+        self.parameter = params.CompositeParameter(
+            average_length=params.ExponentialParameter(1.0 / average_length),
+            child_parameter=self.element_strategy.parameter,
+        )
+
+    def produce_string(self, random, pv, n):
+        """
+        A value of length n.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    def produce(self, random, pv):
+        return self.produce_within(random, pv, UNLIMITED)
+
+    def produce_many(self, random, pv, n):
+        return self.produce_many_within(random, pv, n, UNLIMITED)
+
+    def produce_within(self, random, pv, budget):
+        length = min(budget, dist.geometric(
+            random, 1.0 / (1 + pv.average_length)))
+        return self.produce_string(random, pv, length)
+
+    def produce_many_within(self, random, pv, n, budget):
+        lengths = [
+            min(budget, length) for length in
+            dist.geometrics(random, 1.0 / (1 + pv.average_length), n)
+        ]
+        data = self.produce_string(random, pv, sum(lengths))
+        result = []
+        i = 0
+        for length in lengths:
+            result.append(data[i:i + length])
+            i += length
+        return result
+
+    def splice(self, x, start, end, replacement):
+        """
+        x with the elements from start to end replaced by replacement, which
+        is a value of the same type as x.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    def element_replacements(self, element):
+        """
+        Simpler values to replace element, a length one slice of a value,
+        with when simplifying.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    def simplify(self, x):
+        if not x:
+            return
+        seen = set((x,))
+        for y in self.simplify_candidates(x):
+            if y not in seen:
+                seen.add(y)
+                yield y
+
+    def simplify_candidates(self, x):
+        empty = x[:0]
+        yield empty
+
+        n = len(x)
+        k = n // 2
+        while k > 0:
+            yield x[:n - k]
+            k //= 2
+
+        chunk_size = max(1, n // 2)
+        while True:
+            for start in xrange(0, n, chunk_size):
+                yield self.splice(x, start, start + chunk_size, empty)
+            if chunk_size == 1:
+                break
+            chunk_size //= 2
+
+        for i in xrange(n - 1, -1, -1):
+            for s in self.element_replacements(x[i:i + 1]):
+                yield self.splice(x, i, i + 1, s)
+
+    def is_trusted(self):
+        return (
+            super(StringLikeStrategy, self).is_trusted() and
+            self.element_strategy.is_trusted()
+        )
+
+
+class TextStrategy(StringLikeStrategy):
+    """
+    Text whose characters come from a strategy for one character strings,
+    such as OneCharStringStrategy or UnicodeCharStrategy.
+    """
+    descriptor = text_type
+
+    def produce_string(self, random, pv, n):
+        return text_type('').join(self.element_strategy.produce_many(
+            random, pv.child_parameter, n))
+
+    def splice(self, x, start, end, replacement):
+        return x[:start] + replacement + x[end:]
+
+    def element_replacements(self, element):
+        return self.element_strategy.simplify(element)
+
+    def could_have_produced(self, value):
+        return isinstance(value, text_type) and all(
+            self.element_strategy.could_have_produced(c) for c in value
+        )
+
+
+class BytesStrategy(StringLikeStrategy):
+    """
+    Bytes, which are either uniformly random or made from a small set of
+    byte values chosen by the parameter. Individual bytes are simplified as
+    ints in the range [0, 255].
+    """
+    descriptor = binary_type
+
+    def __init__(self, average_length=100.0):
+        super(BytesStrategy, self).__init__(
+            BoundedIntStrategy(0, 255), average_length)
+        self.parameter = params.CompositeParameter(
+            average_length=params.ExponentialParameter(1.0 / average_length),
+            child_parameter=self.element_strategy.parameter,
+            uniform=params.BiasedCoin(0.5),
+        )
+
+    def produce_string(self, random, pv, n):
+        if pv.uniform:
+            return dist.random_bytes(random, n)
+        return binary_type(bytearray(self.element_strategy.produce_many(
+            random, pv.child_parameter, n)))
+
+    if PY3:
+        def splice(self, x, start, end, replacement):
+            # Joining slices of a memoryview copies x only once
+            view = memoryview(x)
+            return b''.join((view[:start], replacement, view[end:]))
+    else:  # pragma: no cover
+        def splice(self, x, start, end, replacement):
+            return x[:start] + replacement + x[end:]
+
+    def element_replacements(self, element):
+        for b in self.element_strategy.simplify(bytearray(element)[0]):
+            yield binary_type(bytearray((b,)))
+
+    def could_have_produced(self, value):
+        return isinstance(value, binary_type)
+
+
 class FixedKeysDictStrategy(SearchStrategy):
     has_immutable_data = False
 
@@ -604,11 +1520,79 @@ class FixedKeysDictStrategy(SearchStrategy):
         self.descriptor = {}
         for k, v in self.strategy_dict.items():
             self.descriptor[k] = v.descriptor
+        self.has_trivial_templates = all(
+            s.has_trivial_templates for s in self.strategy_dict.values())
+
+    def is_trusted(self):
+        return super(FixedKeysDictStrategy, self).is_trusted() and all(
+            s.is_trusted() for s in self.strategy_dict.values())
 
     def produce(self, random, pv):
+        return self.produce_within(random, pv, UNLIMITED)
+
+    def produce_within(self, random, pv, budget):
+        budget = share_budget(budget, len(self.strategy_dict))
         result = {}
         for k, g in self.strategy_dict.items():
-            result[k] = g.produce(random, pv[k])
+            result[k] = g.produce_within(random, pv[k], budget)
+        return result
+
+    def produce_many_within(self, random, pv, n, budget):
+        return [self.produce_within(random, pv, budget) for _ in xrange(n)]
+
+    def compile_produce(self):
+        if not produces_like(self, FixedKeysDictStrategy):
+            return self.produce_within
+        items = [
+            (k, g.compile_produce()) for k, g in self.strategy_dict.items()]
+        n = len(items)
+
+        def produce_within(random, pv, budget):
+            budget = share_budget(budget, n)
+            result = {}
+            for k, produce in items:
+                result[k] = produce(random, pv[k], budget)
+            return result
+        return produce_within
+
+    def could_have_produced(self, x):
+        return (
+            isinstance(x, dict) and
+            len(x) == len(self.strategy_dict) and
+            all(
+                k in x and g.could_have_produced(x[k])
+                for k, g in self.strategy_dict.items()
+            )
+        )
+
+    def produce_lazily(self, random, pv, budget):
+        return LazyDict(self.strategy_dict, pv, dict(
+            (k, random.getrandbits(64)) for k in self.strategy_dict
+        ), share_budget(budget, len(self.strategy_dict)))
+
+    def realise(self, x):
+        if isinstance(x, LazyDict):
+            return x.realise()
+        return x
+
+    def to_template(self, x):
+        if self.has_trivial_templates:
+            return x
+        return dict(
+            (k, g.to_template(x[k])) for k, g in self.strategy_dict.items())
+
+    def from_template(self, x):
+        if self.has_trivial_templates:
+            return x
+        return dict(
+            (k, g.from_template(x[k])) for k, g in self.strategy_dict.items())
+
+    def copy(self, x):
+        if isinstance(x, LazyDict):
+            return x.fresh()
+        result = {}
+        for k, g in self.strategy_dict.items():
+            result[k] = g.copy(x[k])
         return result
 
     def simplify(self, x):
@@ -647,35 +1631,103 @@ class OneOfStrategy(SearchStrategy):
         self.has_immutable_data = all(
             s.has_immutable_data for s in self.element_strategies)
 
+    def is_trusted(self):
+        return super(OneOfStrategy, self).is_trusted() and all(
+            s.is_trusted() for s in self.element_strategies)
+
+    def cardinality(self):
+        result = 0
+        for s in self.element_strategies:
+            c = s.cardinality()
+            if c is None:
+                return None
+            result += c
+        return result
+
     def could_have_produced(self, x):
         return any((s.could_have_produced(x) for s in self.element_strategies))
 
+    def copy(self, x):
+        if self.has_immutable_data:
+            return x
+        for s in self.element_strategies:
+            if s.could_have_produced(x):
+                return s.copy(x)
+        return deepcopy(x)  # pragma: no cover
+
     def produce(self, random, pv):
+        return self.produce_within(random, pv, UNLIMITED)
+
+    def produce_many(self, random, pv, n):
+        return self.produce_many_within(random, pv, n, UNLIMITED)
+
+    def produce_within(self, random, pv, budget):
         if len(pv.enabled_children) == 1:
             child = pv.enabled_children[0]
         else:
             child = pv.enabled_children[
                 random.randint(0, len(pv.enabled_children) - 1)]
-        return self.element_strategies[child].produce(
-            random, pv.child_parameters[child])
+        return self.element_strategies[child].produce_within(
+            random, pv.child_parameters[child], budget)
+
+    def compile_produce(self):
+        if not produces_like(self, OneOfStrategy):
+            return self.produce_within
+        produces = [s.compile_produce() for s in self.element_strategies]
+
+        def produce_within(random, pv, budget):
+            enabled = pv.enabled_children
+            if len(enabled) == 1:
+                child = enabled[0]
+            else:
+                child = enabled[random.randint(0, len(enabled) - 1)]
+            return produces[child](
+                random, pv.child_parameters[child], budget)
+        return produce_within
+
+    def produce_many_within(self, random, pv, n, budget):
+        enabled = pv.enabled_children
+        choices = [enabled[i] for i in dist.indices(random, len(enabled), n)]
+        values = {}
+        for child in enabled:
+            values[child] = iter(
+                self.element_strategies[child].produce_many_within(
+                    random, pv.child_parameters[child], choices.count(child),
+                    budget))
+        return [next(values[child]) for child in choices]
 
     def simplify(self, x):
+        # Which child a template came from is not recorded, so the templates
+        # of a OneOfStrategy are its values, simplified by their children.
         t = Tracker()
         for cs in self.element_strategies:
             if cs.could_have_produced(x):
-                for y in cs.simplify(x):
+                for y in cs.simplify_value(x):
                     if t.track(y) == 1:
                         yield y
 
 
-class JustStrategy(SearchStrategy):
-    # We could do better here but it's probably not worth it
-    # deepcopy has optimisations that will probably work just as well as
-    # our check
-    has_immutable_data = False
+IMMUTABLE_PRIMITIVES = (
+    bool, float, complex, text_type, binary_type, type(None)
+) + integer_types
 
+
+def is_immutable_primitive(value):
+    """
+    Whether value is a primitive which can never be mutated, or a tuple or
+    frozenset of them.
+    """
+    if type(value) in IMMUTABLE_PRIMITIVES:
+        return True
+    if type(value) in (tuple, frozenset):
+        return all(is_immutable_primitive(x) for x in value)
+    return False
+
+
+class JustStrategy(SearchStrategy):
     def __init__(self, value):
         self.descriptor = descriptors.Just(value)
+        self.has_immutable_data = is_immutable_primitive(value)
 
     def __repr__(self):
         return "JustStrategy(value=%r)" % (self.descriptor.value,)
@@ -688,6 +1740,9 @@ class JustStrategy(SearchStrategy):
     def could_have_produced(self, value):
         return self.descriptor.value == value
 
+    def cardinality(self):
+        return 1
+
 
 class RandomWithSeed(r.Random):
     def __init__(self, seed):
@@ -705,6 +1760,9 @@ class RandomWithSeed(r.Random):
     def __deepcopy__(self, d):
         return self.__copy__()
 
+    def __reduce__(self):
+        return (RandomWithSeed, (self.seed,), self.getstate())
+
     def __eq__(self, other):
         return self is other or (
             isinstance(other, RandomWithSeed) and
@@ -736,3 +1794,144 @@ class SampledFromStrategy(SearchStrategy):
 
     def could_have_produced(self, value):
         return value in self.elements
+
+    def cardinality(self):
+        return len(self.elements)
+
+
+class ArrayStrategy(SearchStrategy):
+    """
+    Generates numpy arrays of a fixed dtype and a shape in which dimensions
+    that are None vary in length. Every element of an array is drawn in a
+    single vectorised call, and simplification works on whole blocks of
+    the array at a time, splitting it into at most MAX_BLOCKS of them, so
+    that it stays tractable for arrays with very many elements.
+    """
+    has_immutable_data = False
+    MAX_BLOCKS = 64
+
+    def __init__(self, shape, dtype, average_length=10.0):
+        SearchStrategy.__init__(self)
+        if numpy is None:
+            raise ValueError('Generating arrays requires numpy')
+        self.shape = tuple(shape)
+        self.dtype = numpy.dtype(dtype)
+        self.descriptor = descriptors.Array(self.shape, dtype)
+        kind = self.dtype.kind
+        if kind == 'b':
+            elements = params.CompositeParameter(
+                p=params.UniformFloatParameter(0, 1),
+            )
+        elif kind in 'iu':
+            elements = params.CompositeParameter(
+                negative_probability=params.BetaFloatParameter(0.5, 0.5),
+                p=params.BetaFloatParameter(alpha=0.2, beta=1.8),
+            )
+        elif kind == 'f':
+            elements = params.CompositeParameter(
+                mean=params.NormalParameter(0, 1),
+                sd=params.ExponentialParameter(1),
+            )
+        else:
+            raise ValueError(
+                "Cannot generate arrays of dtype %s" % (self.dtype,))
+        self.parameter = params.CompositeParameter(
+            average_length=params.ExponentialParameter(1.0 / average_length),
+            elements=elements,
+        )
+
+    def produce(self, random, pv):
+        shape = tuple(
+            dist.geometric(random, 1.0 / (1 + pv.average_length))
+            if d is None else d
+            for d in self.shape
+        )
+        n = 1
+        for d in shape:
+            n *= d
+        rnd = dist.numpy_generator(random)
+        p = pv.elements
+        kind = self.dtype.kind
+        if kind == 'b':
+            values = rnd.uniform(0, 1, n) <= p.p
+        elif kind in 'iu':
+            info = numpy.iinfo(self.dtype)
+            # numpy.geometric overflows for very small p
+            values = numpy.minimum(
+                rnd.geometric(max(p.p, 1e-12), n) - 1, info.max)
+            if kind == 'i':
+                negative = rnd.uniform(0, 1, n) <= p.negative_probability
+                values = numpy.where(negative, -values, values)
+        else:
+            values = rnd.normal(p.mean, p.sd, n)
+        return values.astype(self.dtype).reshape(shape)
+
+    def copy(self, value):
+        return value.copy()
+
+    def could_have_produced(self, value):
+        return (
+            isinstance(value, numpy.ndarray) and
+            value.dtype == self.dtype and
+            len(value.shape) == len(self.shape) and
+            all(
+                d is None or d == e
+                for d, e in zip(self.shape, value.shape)
+            )
+        )
+
+    def blocks(self, n):
+        """
+        The (start, end) bounds of blocks of n elements, first in halves and
+        then in successively smaller blocks down to single elements or
+        MAX_BLOCKS blocks, whichever is larger.
+        """
+        size = max(1, n // 2)
+        while True:
+            for start in xrange(0, n, size):
+                yield start, min(n, start + size)
+            if size == 1 or n // (size // 2) > self.MAX_BLOCKS:
+                break
+            size //= 2
+
+    def simpler_blocks(self, block):
+        kind = self.dtype.kind
+        if kind == 'b':
+            return
+        if kind != 'u' and (block < 0).any():
+            yield numpy.abs(block)
+        if kind == 'f':
+            finite = numpy.where(numpy.isfinite(block), block, 0)
+            truncated = numpy.trunc(finite)
+            if (truncated != block).any():
+                yield truncated
+            halved = numpy.trunc(finite / 2)
+        else:
+            halved = numpy.sign(block) * (numpy.abs(block) // 2)
+        if (halved != block).any():
+            yield halved.astype(self.dtype)
+
+    def simplify(self, x):
+        for axis, d in enumerate(self.shape):
+            if d is None and x.shape[axis] > 0:
+                length = x.shape[axis]
+                yield numpy.take(x, [], axis=axis)
+                if length > 1:
+                    yield numpy.take(x, range(length // 2), axis=axis)
+                for start, end in self.blocks(length):
+                    yield numpy.delete(x, slice(start, end), axis=axis)
+        if not x.size:
+            return
+        if x.any():
+            yield numpy.zeros_like(x)
+        flat = x.reshape(-1)
+        for start, end in self.blocks(x.size):
+            if flat[start:end].any():
+                y = x.copy()
+                y.reshape(-1)[start:end] = 0
+                yield y
+        for start, end in self.blocks(x.size):
+            for block in self.simpler_blocks(flat[start:end]):
+                y = x.copy()
+                y.reshape(-1)[start:end] = block
+                yield y
@@ -1,3 +1,8 @@
+# Marks a setting for which None is a meaningful value as not having been
+# passed, so that it should be taken from the default settings.
+not_set = object()
+
+
 class Settings(object):
     """
     A settings object controls a variety of parameters that are used in
@@ -20,6 +25,37 @@ class Settings(object):
         randomness from your tests, which may be preferable for some situations
         . It does have the disadvantage of making your tests less likely to
         find novel breakages.
+    database_path: If set, the path of a directory in which to store the
+        examples that falsify each hypothesis. Subsequent calls to falsify for
+        the same hypothesis and argument types will try these examples before
+        generating any new ones.
+    validation: How often values are checked against the could_have_produced
+        method of the strategy that produced them, both when generating and
+        when simplifying. 'always' checks every value. 'sampled' checks one
+        in every validation_interval values. 'trusted' skips the check for
+        strategies built in to Hypothesis and always does it for others.
+    tracker: How duplicate examples are detected. 'exact' keeps every example
+        seen. 'fingerprint' keeps only a 16 byte digest of each, and at most
+        tracker_capacity of them if that is set. 'bloom' uses a fixed size
+        Bloom filter sized for tracker_capacity examples. The latter two
+        may very occasionally skip an example as a duplicate when it is not.
+    concurrency: When the hypothesis is a coroutine function, up to this many
+        examples are run on its event loop at once.
+    threads: If this is greater than one, examples are still generated on the
+        calling thread but the hypothesis is called on them from this many
+        worker threads. This only helps if the hypothesis spends most of its
+        time in code which releases the GIL.
+    lazy: If this is True, lists and fixed key dicts are passed to the
+        hypothesis as list and dict like objects whose elements are only
+        generated when they are first looked at, which saves generating
+        examples that are rejected after looking at only part of them. An
+        example is turned into ordinary lists and dicts once it has been
+        run. Duplicate examples are not detected in this mode.
+    max_example_size: A limit on the total size of each example generated,
+        counting the number of characters in strings and of values other than
+        collections and strings anywhere in it. Collections split what is
+        left of the limit between their elements, so it holds however
+        deeply nested the example is.
 
     """
     def __init__(
@@ -29,6 +65,16 @@ class Settings(object):
         max_skipped_examples=None,
         timeout=None,
         derandomize=None,
+        processes=None,
+        database_path=not_set,
+        validation=None,
+        validation_interval=None,
+        tracker=None,
+        tracker_capacity=not_set,
+        concurrency=None,
+        threads=None,
+        lazy=None,
+        max_example_size=None,
     ):
         self.min_satisfying_examples = (
             min_satisfying_examples or default.min_satisfying_examples)
@@ -40,6 +86,26 @@ class Settings(object):
             self.derandomize = default.derandomize
         else:
             self.derandomize = derandomize
+        self.processes = processes or default.processes
+        if database_path is not_set:
+            self.database_path = default.database_path
+        else:
+            self.database_path = database_path
+        self.validation = validation or default.validation
+        self.validation_interval = (
+            validation_interval or default.validation_interval)
+        self.tracker = tracker or default.tracker
+        if tracker_capacity is not_set:
+            self.tracker_capacity = default.tracker_capacity
+        else:
+            self.tracker_capacity = tracker_capacity
+        self.concurrency = concurrency or default.concurrency
+        self.threads = threads or default.threads
+        if lazy is None:
+            self.lazy = default.lazy
+        else:
+            self.lazy = lazy
+        self.max_example_size = max_example_size or default.max_example_size
 
 
 default = Settings(
@@ -48,4 +114,14 @@ default = Settings(
     timeout=60,
     max_skipped_examples=50,
     derandomize=False,
+    processes=1,
+    database_path=None,
+    validation='always',
+    validation_interval=10,
+    tracker='exact',
+    tracker_capacity=None,
+    concurrency=1,
+    threads=1,
+    lazy=False,
+    max_example_size=10000,
 )
@@ -227,12 +227,12 @@ class StatefulStrategy(MappedSearchStrategy):
         else:
             return steps
 
-    def simplify(self, x):
-        pruned = x.prune()
+    def simplify(self, template):
+        pruned = self.from_template(template).prune()
         if pruned:
-            yield pruned
+            yield self.to_template(pruned)
 
-        for y in super(StatefulStrategy, self).simplify(x):
+        for y in super(StatefulStrategy, self).simplify(template):
             yield y
 
 StrategyTable.default().define_specification_for_classes(
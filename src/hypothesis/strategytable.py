@@ -38,12 +38,14 @@ strategy_for(bool)(strat.BoolStrategy())
 
 @strategy_for(text_type)
 def define_text_type_strategy(strategies, descriptor):
-    child = strategies.new_child_mapper()
-    c = strat.OneCharStringStrategy()
-    child.define_specification_for(
-        text_type, lambda x, y: c)
-    list_of_strings = child.strategy([text_type])
-    return strat.StringStrategy(list_of_strings)
+    return strat.TextStrategy(strat.OneCharStringStrategy())
+
+
+@strategy_for_instances(descriptors.Characters)
+def define_characters_strategy(strategies, descriptor):
+    return strat.UnicodeCharStrategy(
+        descriptor.categories, descriptor.min_codepoint,
+        descriptor.max_codepoint)
 
 
 @strategy_for(float)
@@ -56,10 +58,7 @@ def define_float_strategy(strategies, descriptor):
 
 @strategy_for(binary_type)
 def define_binary_strategy(strategies, descriptor):
-    return strat.BinaryStringStrategy(
-        strategy=strategies.strategy([descriptors.integers_in_range(0, 255)]),
-        descriptor=binary_type,
-    )
+    return strat.BytesStrategy()
 
 
 @strategy_for_instances(set)
@@ -128,6 +127,11 @@ def define_random_strategy(strategies, descriptor):
     return strat.RandomStrategy()
 
 
+@strategy_for_instances(descriptors.Array)
+def define_array_strategy(strategies, descriptor):
+    return strat.ArrayStrategy(descriptor.shape, descriptor.dtype)
+
+
 @strategy_for_instances(descriptors.SampledFrom)
 def define_sampled_strategy(strategies, descriptor):
     return strat.SampledFromStrategy(descriptor.elements)
@@ -2,6 +2,7 @@ import time
 from hypothesis.verifier import (
     Verifier, Unfalsifiable, UnsatisfiedAssumption, Flaky
 )
+from hypothesis.internal.compat import iscoroutinefunction
 
 
 def given(*generator_arguments, **kwargs):
@@ -17,15 +18,19 @@ def given(*generator_arguments, **kwargs):
         def wrapped_test(*arguments):
             # The only thing we accept in falsifying the test are exceptions
             # Returning successfully is always a pass.
-            def to_falsify(xs):
-                testargs, testkwargs = xs
-                try:
-                    test(*(arguments + testargs), **testkwargs)
-                    return True
-                except UnsatisfiedAssumption as e:
-                    raise e
-                except Exception:
-                    return False
+            if iscoroutinefunction(test):
+                from hypothesis.internal import coroutines
+                to_falsify = coroutines.falsifier_for(test, arguments)
+            else:
+                def to_falsify(xs):
+                    testargs, testkwargs = xs
+                    try:
+                        test(*(arguments + testargs), **testkwargs)
+                        return True
+                    except UnsatisfiedAssumption as e:
+                        raise e
+                    except Exception:
+                        return False
 
             to_falsify.__name__ = test.__name__
             to_falsify.__qualname__ = getattr(
@@ -40,7 +45,11 @@ def given(*generator_arguments, **kwargs):
             # We run this one final time so we get good errors
             # Otherwise we would have swallowed all the reports of it actually
             # having gone wrong.
-            test(*(arguments + falsifying_example[0]), **falsifying_example[1])
+            result = test(
+                *(arguments + falsifying_example[0]), **falsifying_example[1])
+            if iscoroutinefunction(test):
+                from hypothesis.internal import coroutines
+                coroutines.run(result)
 
             # If we get here then something has gone wrong: We found a counter
             # example but it didn't fail when we invoked it again.
@@ -1,12 +1,24 @@
 from hypothesis.strategytable import StrategyTable
 from random import Random
+from collections import namedtuple
+import hashlib
 import time
-from hypothesis.internal.compat import xrange
+from multiprocessing.pool import ThreadPool
+from hypothesis.internal.compat import (
+    xrange, fork_context, iscoroutine, iscoroutinefunction
+)
 import hypothesis.settings as hs
 from hypothesis.internal.utils.reflection import (
     get_pretty_function_description, function_digest
 )
-from hypothesis.internal.tracker import Tracker
+from hypothesis.internal.tracker import tracker_for_settings
+from hypothesis.internal.utils.hashitanyway import equal_everything
+from hypothesis.database import ExampleDatabase
+from hypothesis.internal.evaluationcache import (
+    EvaluationCache, PASSED, FALSIFIED, REJECTED
+)
+from hypothesis.internal.statistics import Statistics, timer
+from hypothesis.internal.validation import Validator
 
 
 def assume(condition):
@@ -14,6 +26,104 @@ def assume(condition):
         raise UnsatisfiedAssumption()
 
 
+def evaluate(hypothesis, search_strategy, args, statistics):
+    """
+    Call hypothesis on a copy of args and return whether it PASSED, was
+    FALSIFIED or REJECTED the example with a failed assumption. Time spent
+    copying and in the hypothesis is recorded in statistics.
+    """
+    started = timer()
+    args = search_strategy.copy(args)
+    started = statistics.record('copy', started)
+    try:
+        result = hypothesis(*args)
+        if iscoroutine(result):
+            from hypothesis.internal.coroutines import run
+            result = run(result)
+        if result:
+            status = PASSED
+        else:
+            status = FALSIFIED
+    except AssertionError:
+        status = FALSIFIED
+    except UnsatisfiedAssumption:
+        status = REJECTED
+        statistics.assumptions_rejected += 1
+    statistics.record('test', started)
+    return status
+
+
+def evaluate_serially(hypothesis, search_strategy, examples, statistics):
+    return [
+        evaluate(hypothesis, search_strategy, args, statistics)
+        for args in examples
+    ]
+
+
+def evaluate_in_threads(
+    thread_pool, hypothesis, search_strategy, examples, statistics
+):
+    """
+    Evaluate each of examples on a thread from thread_pool, returning their
+    statuses in the same order as examples. Each thread records into its own
+    Statistics, which are merged into statistics once they have all finished.
+    """
+    separate_statistics = [Statistics() for _ in examples]
+    statuses = thread_pool.map(
+        lambda i: evaluate(
+            hypothesis, search_strategy, examples[i], separate_statistics[i]),
+        xrange(len(examples))
+    )
+    for s in separate_statistics:
+        statistics.merge(s)
+    return statuses
+
+
+SearchResult = namedtuple('SearchResult', (
+    'falsifying_examples', 'examples_found', 'satisfying_examples',
+    'exhausted', 'statistics',
+))
+
+
+def _search_in_worker(connection, verifier, args):
+    """
+    Entry point for a worker process of a parallel search. The process is
+    forked so its arguments are inherited rather than pickled, which means
+    that neither the hypothesis nor the search strategy needs to be picklable.
+
+    If the search raises or its result cannot be sent back we send None
+    instead. The search is determined by its seed, so the parent can then run
+    it again itself and get the same example or error.
+    """
+    try:
+        result = verifier.search(*args)
+        connection.send(result)
+    except Exception:
+        connection.send(None)
+    finally:
+        connection.close()
+
+
+def merge_search_results(results):
+    """
+    Combine the results of several searches which found no falsifying
+    examples. Each search tracks duplicates separately, so the combined
+    examples_found may count the same example more than once. The parameter
+    space is only considered exhausted if every search exhausted it.
+    """
+    results = list(results)
+    statistics = Statistics()
+    for r in results:
+        statistics.merge(r.statistics)
+    return SearchResult(
+        [],
+        sum(r.examples_found for r in results),
+        sum(r.satisfying_examples for r in results),
+        exhausted=bool(results) and all(r.exhausted for r in results),
+        statistics=statistics,
+    )
+
+
 class Verifier(object):
     def __init__(
         self,
@@ -23,11 +133,21 @@ class Verifier(object):
     ):
         if settings is None:
             settings = hs.default
+        self.settings = settings
         self.strategy_table = strategy_table or StrategyTable()
         self.min_satisfying_examples = settings.min_satisfying_examples
         self.max_skipped_examples = settings.max_skipped_examples
         self.max_examples = settings.max_examples
         self.timeout = settings.timeout
+        self.processes = settings.processes
+        self.concurrency = settings.concurrency
+        self.threads = settings.threads
+        self.lazy = settings.lazy
+        self.max_example_size = settings.max_example_size
+        if settings.database_path:
+            self.database = ExampleDatabase(settings.database_path)
+        else:
+            self.database = None
         if settings.derandomize and random:
             raise ValueError(
                 "A verifier cannot both be derandomized and have a random "
@@ -38,6 +158,7 @@ class Verifier(object):
         else:
             self.random = random or Random()
         self.max_regenerations = 0
+        self.last_statistics = None
 
     def falsify(self, hypothesis, *argument_types):
         random = self.random
@@ -49,126 +170,370 @@ class Verifier(object):
         search_strategy = (self.strategy_table
                                .specification_for(argument_types))
 
+        cache = EvaluationCache()
+        statistics = Statistics()
+        self.last_statistics = statistics
+
         def falsifies(args):
-            try:
-                return not hypothesis(*search_strategy.copy(args))
-            except AssertionError:
-                return True
-            except UnsatisfiedAssumption:
-                return False
+            status = cache.get(args)
+            if status is None:
+                status = evaluate(
+                    hypothesis, search_strategy, args, statistics)
+                cache.record(args, status)
+            else:
+                statistics.duplicates_skipped += 1
+            return status == FALSIFIED
+
+        def fail(exception):
+            exception.statistics = statistics
+            raise exception
 
-        falsifying_examples = []
-        examples_found = 0
-        satisfying_examples = 0
-        timed_out = False
         if argument_types:
             max_examples = self.max_examples
             min_satisfying_examples = self.min_satisfying_examples
-            parameter_values = max(2, int(float(max_examples) / 5))
         else:
             max_examples = 1
             min_satisfying_examples = 1
-            parameter_values = 1
-
-        def generate_parameter_values():
-            return [
-                search_strategy.parameter.draw(random)
-                for _ in xrange(parameter_values)
-            ]
-
-        parameter_values = generate_parameter_values()
-        accepted_examples = [0] * max_examples
-        rejected_examples = [0] * max_examples
-        track_seen = Tracker()
 
         start_time = time.time()
 
         def time_to_call_it_a_day():
             return time.time() >= start_time + self.timeout
 
-        initial_run = 0
-        skipped_examples = 0
-
-        while not (
-            examples_found >= max_examples or
-            len(falsifying_examples) >= 1
-        ):
-            if time_to_call_it_a_day():
-                break
+        result = None
+        if self.database is not None:
+            database_key = self.database_key(hypothesis, argument_types)
+            result = self.replay_saved_examples(
+                database_key, search_strategy, falsifies, statistics
+            )
 
-            if initial_run < len(parameter_values):
-                i = initial_run
-                initial_run += 1
+        if result is None:
+            if self.processes > 1 and max_examples > 1:
+                result = self.search_in_processes(
+                    hypothesis, search_strategy, random, max_examples,
+                    start_time, statistics
+                )
             else:
-                i = max(
-                    xrange(len(parameter_values)),
-                    key=lambda k: random.betavariate(
-                        accepted_examples[k] + 1, rejected_examples[k] + 1
-                    )
+                result = self.search(
+                    hypothesis, search_strategy, random, max_examples,
+                    start_time, cache, statistics
                 )
-            pv = parameter_values[i]
+        falsifying_examples = result.falsifying_examples
+        satisfying_examples = result.satisfying_examples
 
-            args = search_strategy.produce(random, pv)
-            assert search_strategy.could_have_produced(args)
-
-            if track_seen.track(args) > 1:
-                rejected_examples[i] += 1
-                skipped_examples += 1
-                if skipped_examples >= self.max_skipped_examples:
-                    raise Exhausted(hypothesis, examples_found)
-                else:
-                    # This really is covered. I suspect a bug in coverage that
-                    # I have not yet narrowed down. It is impossible to execute
-                    # the other branch without first executing this one and
-                    # there is a test that cannot pass without executing the
-                    # other branch.
-                    continue  # pragma: no cover
-            else:
-                skipped_examples = 0
-            examples_found += 1
-            try:
-                is_falsifying_example = not hypothesis(
-                    *search_strategy.copy(args))
-            except AssertionError:
-                is_falsifying_example = True
-            except UnsatisfiedAssumption:
-                rejected_examples[i] += 1
-                continue
-            accepted_examples[i] += 1
-            satisfying_examples += 1
-            if is_falsifying_example:
-                falsifying_examples.append(args)
         run_time = time.time() - start_time
         timed_out = run_time >= self.timeout
 
         if not falsifying_examples:
-            if satisfying_examples < min_satisfying_examples:
-                raise Unsatisfiable(hypothesis, satisfying_examples, run_time)
+            if result.exhausted:
+                fail(Exhausted(hypothesis, result.examples_found))
+            elif satisfying_examples < min_satisfying_examples:
+                fail(Unsatisfiable(hypothesis, satisfying_examples, run_time))
             elif timed_out:
-                raise Timeout(hypothesis, satisfying_examples, run_time)
+                fail(Timeout(hypothesis, satisfying_examples, run_time))
             else:
-                raise Unfalsifiable(hypothesis)
+                fail(Unfalsifiable(hypothesis))
 
+        # This deliberately calls the hypothesis again rather than trusting
+        # the cache: The whole point is to check that it gives the same answer
+        # the second time.
         for x in falsifying_examples:
-            if not falsifies(x):
-                raise Flaky(hypothesis, x)
-
-        best_example = falsifying_examples[0]
-
-        for t in search_strategy.simplify_such_that(best_example, falsifies):
+            status = evaluate(hypothesis, search_strategy, x, statistics)
+            cache.record(x, status)
+            if status != FALSIFIED:
+                fail(Flaky(hypothesis, x))
+
+        original_example = best_example = falsifying_examples[0]
+        if self.database is not None:
+            self.database.save(database_key, best_example)
+
+        def shrink_candidate_falsifies(args):
+            statistics.shrinks_tried += 1
+            return falsifies(args)
+
+        started = timer()
+        for t in search_strategy.simplify_such_that(
+            best_example, shrink_candidate_falsifies, self.settings
+        ):
             best_example = t
             if time_to_call_it_a_day():
                 break
-
+        statistics.record('shrink', started)
+
+        if self.database is not None:
+            self.database.save(database_key, best_example)
+            # Once we have something simpler there is no point in ever
+            # replaying the original, and doing so would mean paying for the
+            # whole shrink again.
+            if not equal_everything(best_example, original_example):
+                self.database.delete(database_key, original_example)
         return best_example
 
+    def database_key(self, hypothesis, argument_types):
+        """
+        The key to store examples for hypothesis under. This includes the
+        argument types so that examples for one are never replayed for
+        another.
+        """
+        hasher = hashlib.md5()
+        hasher.update(function_digest(hypothesis))
+        hasher.update(repr(argument_types).encode('utf-8'))
+        return hasher.digest()
+
+    def replay_saved_examples(
+        self, key, search_strategy, falsifies, statistics
+    ):
+        """
+        Try each example saved in the database under key, returning a result
+        for the first one that still falsifies the hypothesis or None if none
+        do. Examples which no longer falsify it are removed.
+        """
+        for example in self.database.fetch(key):
+            if not search_strategy.could_have_produced(example):
+                continue
+            if falsifies(example):
+                return SearchResult(
+                    [example], 1, 1, exhausted=False, statistics=statistics
+                )
+            self.database.delete(key, example)
+
+    def search(
+        self, hypothesis, search_strategy, random, max_examples, start_time,
+        cache=None, statistics=None,
+    ):
+        """
+        Run the generate and test loop for up to max_examples examples, or
+        until the first falsifying example is found or the timeout expires.
+        The result of each call to hypothesis is recorded in cache, and the
+        time spent on each phase in statistics.
+        """
+        if cache is None:
+            cache = EvaluationCache()
+        if statistics is None:
+            statistics = Statistics()
+        falsifying_examples = []
+        examples_found = 0
+        satisfying_examples = 0
+        if max_examples > 1:
+            parameter_values = max(2, int(float(max_examples) / 5))
+        else:
+            parameter_values = 1
+
+        def generate_parameter_values():
+            result = []
+            for _ in xrange(parameter_values):
+                started = timer()
+                result.append(search_strategy.parameter.draw(random))
+                statistics.record('draw', started)
+            return result
+
+        parameter_values = generate_parameter_values()
+        accepted_examples = [0] * max_examples
+        rejected_examples = [0] * max_examples
+        track_seen = tracker_for_settings(self.settings)
+        validator = Validator.for_settings(search_strategy, self.settings)
+        produce = search_strategy.compile_produce()
+
+        def time_to_call_it_a_day():
+            return time.time() >= start_time + self.timeout
+
+        thread_pool = None
+        if self.concurrency > 1 and iscoroutinefunction(hypothesis):
+            from hypothesis.internal.coroutines import evaluate_concurrently
+            batch_size = self.concurrency
+            evaluate_batch = evaluate_concurrently
+        elif self.threads > 1:
+            thread_pool = ThreadPool(self.threads)
+            batch_size = self.threads
+
+            def evaluate_batch(hypothesis, search_strategy, examples, stats):
+                return evaluate_in_threads(
+                    thread_pool, hypothesis, search_strategy, examples, stats)
+        else:
+            batch_size = 1
+            evaluate_batch = evaluate_serially
+
+        initial_run = 0
+        skipped_examples = 0
+        exhausted = False
+
+        try:
+            while not (
+                examples_found >= max_examples or
+                len(falsifying_examples) >= 1 or
+                exhausted
+            ):
+                # We generate a batch of examples before running any of them
+                # so that they can be run concurrently. Their results are then
+                # used in the order they were generated, so a batch size of
+                # one is exactly the plain generate and test loop.
+                batch = []
+                while (
+                    len(batch) < batch_size and
+                    examples_found + len(batch) < max_examples
+                ):
+                    if time_to_call_it_a_day():
+                        break
+
+                    if initial_run < len(parameter_values):
+                        i = initial_run
+                        initial_run += 1
+                    else:
+                        i = max(
+                            xrange(len(parameter_values)),
+                            key=lambda k: random.betavariate(
+                                accepted_examples[k] + 1,
+                                rejected_examples[k] + 1
+                            )
+                        )
+                    pv = parameter_values[i]
+
+                    if self.lazy:
+                        # Nothing can be checked or tracked without
+                        # generating the whole example, so that waits until
+                        # it has been run and not rejected.
+                        started = timer()
+                        batch.append((i, search_strategy.produce_lazily(
+                            random, pv, self.max_example_size)))
+                        statistics.record('produce', started)
+                        continue
+
+                    started = timer()
+                    args = produce(random, pv, self.max_example_size)
+                    started = statistics.record('produce', started)
+                    if validator.due():
+                        assert search_strategy.could_have_produced(args)
+                        started = statistics.record(
+                            'could_have_produced', started)
+
+                    seen = track_seen.track(args)
+                    statistics.record('track', started)
+                    if seen > 1:
+                        rejected_examples[i] += 1
+                        skipped_examples += 1
+                        statistics.duplicates_skipped += 1
+                        if skipped_examples >= self.max_skipped_examples:
+                            exhausted = True
+                            break
+                    else:
+                        skipped_examples = 0
+                        batch.append((i, args))
+                if not batch:
+                    break
+
+                if self.lazy:
+                    statuses = [None] * len(batch)
+                else:
+                    statuses = [cache.get(args) for _, args in batch]
+                unknown = [
+                    args for (_, args), status in zip(batch, statuses)
+                    if status is None
+                ]
+                if unknown:
+                    results = iter(evaluate_batch(
+                        hypothesis, search_strategy, unknown, statistics))
+                    for j, (_, args) in enumerate(batch):
+                        if statuses[j] is None:
+                            statuses[j] = next(results)
+                            if not self.lazy:
+                                cache.record(args, statuses[j])
+
+                for (i, args), status in zip(batch, statuses):
+                    examples_found += 1
+                    if status == REJECTED:
+                        rejected_examples[i] += 1
+                        continue
+                    if self.lazy:
+                        started = timer()
+                        args = search_strategy.realise(args)
+                        statistics.record('produce', started)
+                        validator.validate(args)
+                        cache.record(args, status)
+                    accepted_examples[i] += 1
+                    satisfying_examples += 1
+                    if status == FALSIFIED:
+                        falsifying_examples.append(args)
+                        break
+        finally:
+            if thread_pool is not None:
+                thread_pool.close()
+                thread_pool.join()
+        statistics.record_false_positive_rate(track_seen)
+        return SearchResult(
+            falsifying_examples, examples_found, satisfying_examples,
+            exhausted=exhausted and not falsifying_examples,
+            statistics=statistics,
+        )
+
+    def search_in_processes(
+        self, hypothesis, search_strategy, random, max_examples, start_time,
+        statistics,
+    ):
+        """
+        Split the search across self.processes forked worker processes, each
+        of which runs search with its own share of max_examples and a seed
+        drawn from random. The statistics of every worker whose result is
+        consumed are merged into statistics.
+
+        Results are consumed in worker order rather than completion order, so
+        the example found depends only on random and not on scheduling. Once
+        a worker has produced a falsifying example the others are terminated.
+        """
+        context = fork_context()
+        if context is None:
+            return self.search(
+                hypothesis, search_strategy, random, max_examples, start_time,
+                statistics=statistics,
+            )
+        n = min(self.processes, max_examples)
+        seeds = [random.getrandbits(64) for _ in xrange(n)]
+        budgets = [max_examples // n] * n
+        for i in xrange(max_examples % n):
+            budgets[i] += 1
+
+        worker_args = [
+            (hypothesis, search_strategy, Random(seeds[i]), budgets[i],
+             start_time)
+            for i in xrange(n)
+        ]
+        workers = []
+        try:
+            for args in worker_args:
+                receiver, sender = context.Pipe(duplex=False)
+                worker = context.Process(
+                    target=_search_in_worker, args=(sender, self, args))
+                worker.daemon = True
+                worker.start()
+                sender.close()
+                workers.append((worker, receiver))
+            results = []
+            for args, (worker, receiver) in zip(worker_args, workers):
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = None
+                if result is None:
+                    return self.search(*args, statistics=statistics)
+                statistics.merge(result.statistics)
+                if result.falsifying_examples:
+                    return result
+                results.append(result)
+            return merge_search_results(results)
+        finally:
+            for worker, receiver in workers:
+                receiver.close()
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+
 
 def falsify(*args, **kwargs):
     return Verifier(**kwargs).falsify(*args)
 
 
 class HypothesisException(Exception):
-    pass
+    # The Statistics of the falsify call that raised this, if any
+    statistics = None
 
 
 class UnsatisfiedAssumption(HypothesisException):
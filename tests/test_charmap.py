@@ -0,0 +1,57 @@
+import hypothesis.internal.charmap as cm
+from hypothesis.internal.compat import unichr
+import unicodedata
+import sys
+import pytest
+
+
+def test_charmap_covers_every_codepoint_once():
+    total = 0
+    for intervals in cm.charmap().values():
+        for start, end in intervals:
+            assert start <= end
+            total += end - start + 1
+    assert total == sys.maxunicode + 1
+
+
+def test_charmap_intervals_have_the_right_category():
+    for category, intervals in cm.charmap().items():
+        for start, end in intervals[:10]:
+            assert unicodedata.category(unichr(start)) == category
+            assert unicodedata.category(unichr(end)) == category
+
+
+def test_interval_set_indexes_like_a_sorted_list():
+    xs = cm.IntervalSet([(10, 12), (1, 3), (3, 5), (20, 20)])
+    members = [1, 2, 3, 4, 5, 10, 11, 12, 20]
+    assert len(xs) == len(members)
+    assert [xs[i] for i in range(len(xs))] == members
+    assert xs[-1] == 20
+    for i, x in enumerate(members):
+        assert x in xs
+        assert xs.index(x) == i
+    assert 6 not in xs
+    assert 0 not in xs
+    with pytest.raises(ValueError):
+        xs.index(15)
+    with pytest.raises(IndexError):
+        xs[len(xs)]
+
+
+def test_query_without_categories_excludes_surrogates():
+    xs = cm.query()
+    assert len(xs) == sys.maxunicode + 1 - (
+        cm.SURROGATES[1] - cm.SURROGATES[0] + 1)
+    assert 0xD800 not in xs
+    assert 0xE000 in xs
+
+
+def test_query_restricts_to_categories_and_range():
+    xs = cm.query(('Lu',), 0, 127)
+    assert [unichr(xs[i]) for i in range(len(xs))] == [
+        unichr(c) for c in range(ord('A'), ord('Z') + 1)]
+
+
+def test_query_rejects_unknown_categories():
+    with pytest.raises(ValueError):
+        cm.query(('Xx',))
@@ -0,0 +1,102 @@
+import asyncio
+
+from hypothesis import Verifier, assume, given, Unfalsifiable
+from hypothesis.settings import Settings
+import pytest
+
+
+class InFlight(object):
+
+    def __init__(self):
+        self.current = 0
+        self.most = 0
+
+    async def wait(self):
+        self.current += 1
+        self.most = max(self.most, self.current)
+        await asyncio.sleep(0)
+        self.current -= 1
+
+
+def test_can_falsify_a_coroutine_function():
+    async def is_small(x):
+        await asyncio.sleep(0)
+        return x < 10
+
+    assert Verifier().falsify(is_small, int) == (10,)
+
+
+def test_coroutines_can_use_assertions_and_assumptions():
+    async def is_small_and_even(x):
+        assume(x % 2 == 0)
+        assert x < 10
+        return True
+
+    assert Verifier().falsify(is_small_and_even, int) == (10,)
+
+
+def test_runs_one_example_at_a_time_by_default():
+    in_flight = InFlight()
+
+    async def passes(x):
+        await in_flight.wait()
+        return True
+
+    with pytest.raises(Unfalsifiable):
+        Verifier().falsify(passes, int)
+    assert in_flight.most == 1
+
+
+def test_runs_examples_concurrently():
+    in_flight = InFlight()
+
+    async def passes(x):
+        await in_flight.wait()
+        return True
+
+    verifier = Verifier(settings=Settings(concurrency=8))
+    with pytest.raises(Unfalsifiable):
+        verifier.falsify(passes, int)
+    assert in_flight.most == 8
+
+
+def test_concurrent_derandomized_falsification_is_deterministic():
+    settings = Settings(concurrency=4, derandomize=True)
+
+    def examples_seen():
+        seen = []
+
+        async def is_small(xs):
+            seen.append(list(xs))
+            await asyncio.sleep(0)
+            return sum(xs) < 50
+
+        result = Verifier(settings=settings).falsify(is_small, [int])
+        return result, seen
+
+    assert examples_seen() == examples_seen()
+
+
+def test_falsifies_concurrently_in_worker_processes():
+    async def is_small(x):
+        await asyncio.sleep(0)
+        return x < 10
+
+    settings = Settings(concurrency=4, processes=2)
+    assert Verifier(settings=settings).falsify(is_small, int) == (10,)
+
+
+@given(int)
+async def test_given_runs_coroutine_tests(x):
+    await asyncio.sleep(0)
+    assert x + 1 > x
+
+
+def test_given_reports_failures_in_coroutine_tests():
+    @given(int, verifier_settings=Settings(concurrency=4))
+    async def test_is_small(x):
+        await asyncio.sleep(0)
+        assert x < 10
+
+    with pytest.raises(AssertionError):
+        test_is_small()
@@ -0,0 +1,102 @@
+from hypothesis.database import ExampleDatabase
+from hypothesis import Verifier
+from hypothesis.settings import Settings
+import hypothesis.descriptors as descriptors
+import os
+
+
+def test_can_save_and_fetch_examples(tmpdir):
+    db = ExampleDatabase(str(tmpdir))
+    db.save(b'foo', (1, [2, 3]))
+    db.save(b'foo', ('hi',))
+    assert sorted(db.fetch(b'foo'), key=repr) == [('hi',), (1, [2, 3])]
+
+
+def test_saving_twice_does_not_duplicate(tmpdir):
+    db = ExampleDatabase(str(tmpdir))
+    db.save(b'foo', (1,))
+    db.save(b'foo', (1,))
+    assert db.fetch(b'foo') == [(1,)]
+
+
+def test_keys_are_distinct(tmpdir):
+    db = ExampleDatabase(str(tmpdir))
+    db.save(b'foo', (1,))
+    assert db.fetch(b'bar') == []
+
+
+def test_can_delete_examples(tmpdir):
+    db = ExampleDatabase(str(tmpdir))
+    db.save(b'foo', (1,))
+    db.save(b'foo', (2,))
+    db.delete(b'foo', (1,))
+    assert db.fetch(b'foo') == [(2,)]
+
+
+def test_does_not_save_unpicklable_examples(tmpdir):
+    db = ExampleDatabase(str(tmpdir))
+    db.save(b'foo', (lambda x: x,))
+    assert db.fetch(b'foo') == []
+
+
+def test_removes_corrupted_examples(tmpdir):
+    db = ExampleDatabase(str(tmpdir))
+    db.save(b'foo', (1,))
+    directory = db.directory_for(b'foo')
+    with open(os.path.join(directory, 'garbage'), 'wb') as f:
+        f.write(b'not a pickle')
+    assert db.fetch(b'foo') == [(1,)]
+    assert len(os.listdir(directory)) == 1
+
+
+def test_does_not_fail_if_the_path_is_not_writable(tmpdir):
+    not_a_directory = tmpdir.join('file')
+    not_a_directory.write('')
+    db = ExampleDatabase(str(not_a_directory))
+    db.save(b'foo', (1,))
+    assert db.fetch(b'foo') == []
+
+
+def test_falsify_works_with_an_unusable_database(tmpdir):
+    not_a_directory = tmpdir.join('file')
+    not_a_directory.write('')
+    settings = Settings(database_path=str(not_a_directory))
+    assert Verifier(settings=settings).falsify(is_small, int) == (10,)
+
+
+calls = []
+
+
+def is_small(x):
+    calls.append(x)
+    return x < 10
+
+
+def test_replays_saved_examples_before_searching(tmpdir):
+    settings = Settings(database_path=str(tmpdir))
+    assert Verifier(settings=settings).falsify(is_small, int) == (10,)
+    del calls[:]
+    assert Verifier(settings=settings).falsify(is_small, int) == (10,)
+    # One call to replay the saved example, one to check it is not flaky and
+    # then one for each of the ten simplifications of 10. No search happens at
+    # all.
+    assert calls[0] == 10
+    assert len(calls) <= 12
+
+
+def test_only_keeps_the_simplest_example(tmpdir):
+    settings = Settings(database_path=str(tmpdir))
+    verifier = Verifier(settings=settings)
+    verifier.falsify(is_small, int)
+    db = ExampleDatabase(str(tmpdir))
+    assert db.fetch(verifier.database_key(is_small, (int,))) == [(10,)]
+
+
+def test_examples_for_different_argument_types_are_kept_apart(tmpdir):
+    settings = Settings(database_path=str(tmpdir))
+    verifier = Verifier(settings=settings)
+    verifier.falsify(is_small, int)
+    ranged = (descriptors.integers_in_range(10, 20),)
+    db = ExampleDatabase(str(tmpdir))
+    assert db.fetch(verifier.database_key(is_small, (int,))) == [(10,)]
+    assert db.fetch(verifier.database_key(is_small, ranged)) == []
@@ -76,3 +76,39 @@ def test_has_a_sensible_string_representation():
     x = str(hia('kittens'))
     assert 'HashItAnyway' in x
     assert 'kittens' in x
+
+
+def test_hashes_permutations_of_lists_differently():
+    assert hash(hia([1, 2, 3])) != hash(hia([3, 2, 1]))
+    assert hash(hia([[1], [2]])) != hash(hia([[2], [1]]))
+
+
+def test_repeated_elements_do_not_cancel_out():
+    assert hash(hia([1, 1])) != hash(hia([]))
+    assert hash(hia([[0], [0]])) != hash(hia([]))
+
+
+def test_hashes_dicts_by_their_values_too():
+    assert hash(hia({1: [2]})) != hash(hia({1: [3]}))
+    assert hash(hia({1: [2], 3: [4]})) == hash(hia({3: [4], 1: [2]}))
+
+
+def test_hashes_sets_regardless_of_order():
+    assert hia({1, 2, 3}) == hia({3, 2, 1})
+    assert hash(hia({1, 2, 3})) == hash(hia({3, 2, 1}))
+
+
+def test_hashes_shared_substructures_consistently():
+    x = [1, 2]
+    assert hash(hia([x, x])) == hash(hia([[1, 2], [1, 2]]))
+
+
+def test_small_lists_of_small_ints_rarely_collide():
+    import itertools
+    hashes = set()
+    n = 0
+    for k in range(4):
+        for xs in itertools.product(range(6), repeat=k):
+            hashes.add(hash(hia(list(xs))))
+            n += 1
+    assert len(hashes) == n
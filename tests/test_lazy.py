@@ -0,0 +1,88 @@
+from hypothesis.internal.lazy import LazyList, LazyDict
+from hypothesis.strategytable import StrategyTable
+import random
+import pytest
+
+
+def lazy_list(size, seed=0):
+    s = StrategyTable().strategy(int)
+    return LazyList(
+        s, s.parameter.draw(random.Random(seed)), seed, size, float('inf'))
+
+
+def lazy_dict(seed=0):
+    table = StrategyTable()
+    strategies = {'a': table.strategy(int), 'b': table.strategy([int])}
+    rnd = random.Random(seed)
+    return LazyDict(
+        strategies,
+        dict((k, v.parameter.draw(rnd)) for k, v in strategies.items()),
+        dict((k, rnd.getrandbits(64)) for k in strategies),
+        float('inf'),
+    )
+
+
+def test_lazy_list_only_generates_what_is_looked_at():
+    xs = lazy_list(1000)
+    assert len(xs) == 1000
+    xs[2]
+    assert len(xs.elements) < 10
+
+
+def test_lazy_list_agrees_with_its_realisation():
+    xs = lazy_list(37)
+    ys = xs.realise()
+    assert type(ys) == list
+    assert len(ys) == 37
+    for i in range(-37, 37):
+        assert xs[i] == ys[i]
+    for s in [
+        slice(None), slice(None, -1), slice(-3, None), slice(2, 30, 7),
+        slice(None, None, -1), slice(30, 2, -3), slice(5, 5),
+    ]:
+        assert xs.fresh()[s] == ys[s]
+    assert list(xs.fresh()) == ys
+    assert xs == ys
+    with pytest.raises(IndexError):
+        xs[37]
+
+
+def test_changing_a_lazy_list_does_not_change_its_realisation():
+    xs = lazy_list(10)
+    ys = xs.realise()
+    xs.append(1)
+    xs.sort()
+    del xs[0]
+    assert len(xs) == 10
+    assert xs == sorted(ys + [1])[1:]
+    assert xs.realise() == ys
+    assert xs.fresh() == ys
+
+
+def test_lazy_list_can_be_empty():
+    xs = lazy_list(0)
+    assert len(xs) == 0
+    assert list(xs) == []
+    assert xs.realise() == []
+
+
+def test_lazy_dict_generates_values_independently():
+    d = lazy_dict()
+    realised = d.realise()
+    assert type(realised) == dict
+    assert sorted(d) == ['a', 'b']
+    assert d['b'] == realised['b']
+    assert 'a' not in d.values
+    assert d == realised
+    with pytest.raises(KeyError):
+        d['c']
+
+
+def test_changing_a_lazy_dict_does_not_change_its_realisation():
+    d = lazy_dict()
+    realised = d.realise()
+    d['c'] = 1
+    del d['a']
+    assert sorted(d) == ['b', 'c']
+    assert d.realise() == realised
+    assert d.fresh() == realised
@@ -0,0 +1,91 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from hypothesis import Verifier, given  # noqa
+from hypothesis.descriptors import arrays  # noqa
+from hypothesis.strategytable import StrategyTable  # noqa
+from hypothesis.internal.utils.hashitanyway import HashItAnyway  # noqa
+from hypothesis.internal.tracker import Tracker, fingerprint  # noqa
+from random import Random  # noqa
+
+
+@pytest.mark.parametrize('dtype', [
+    bool, 'int8', 'uint16', int, 'float32', float,
+])
+@pytest.mark.parametrize('shape', [(3,), (2, 3), (None,), (None, 2), ()])
+def test_produces_arrays_of_the_right_shape_and_dtype(shape, dtype):
+    strategy = StrategyTable().strategy(arrays(shape, dtype))
+    random = Random(0)
+    for _ in range(10):
+        x = strategy.produce(random, strategy.parameter.draw(random))
+        assert strategy.could_have_produced(x)
+        assert x.dtype == numpy.dtype(dtype)
+        for s in strategy.simplify(x):
+            assert strategy.could_have_produced(s)
+
+
+def test_rejects_arrays_of_the_wrong_shape():
+    strategy = StrategyTable().strategy(arrays((None, 2), int))
+    assert strategy.could_have_produced(numpy.zeros((5, 2), dtype=int))
+    assert not strategy.could_have_produced(numpy.zeros((5, 3), dtype=int))
+    assert not strategy.could_have_produced(numpy.zeros(5, dtype=int))
+    assert not strategy.could_have_produced(numpy.zeros((5, 2)))
+    assert not strategy.could_have_produced([[0, 0]])
+
+
+def test_rejects_unsupported_dtypes():
+    with pytest.raises(ValueError):
+        StrategyTable().strategy(arrays(3, object))
+
+
+def test_copies_are_independent():
+    strategy = StrategyTable().strategy(arrays(3, int))
+    x = numpy.arange(3)
+    y = strategy.copy(x)
+    y[0] = 10
+    assert x[0] == 0
+
+
+def test_shrinks_large_arrays_to_a_single_nonzero_block():
+    def all_small(x):
+        return x.max() < 100
+
+    x, = Verifier().falsify(all_small, arrays(10 ** 5, 'int64'))
+    assert x.shape == (10 ** 5,)
+    assert (x != 0).sum() <= 10 ** 5 // 64 + 1
+    assert x.max() >= 100
+
+
+def test_shrinks_variable_length_arrays_by_truncation():
+    x, = Verifier().falsify(lambda x: len(x) < 5, arrays(None, 'int64'))
+    assert x.tolist() == [0] * 5
+
+
+def test_can_find_a_simple_float_array():
+    x, = Verifier().falsify(
+        lambda x: not (x > 1).any(), arrays((None, 3), float))
+    assert x.shape == (1, 3)
+    assert (x != 0).sum() == 1
+    assert x.max() > 1
+
+
+def test_hashes_and_compares_arrays_structurally():
+    assert HashItAnyway(numpy.arange(3)) == HashItAnyway(numpy.arange(3))
+    assert HashItAnyway(numpy.arange(3)) != HashItAnyway(numpy.arange(4))
+    assert HashItAnyway([numpy.arange(3)]) == HashItAnyway([numpy.arange(3)])
+    assert HashItAnyway((numpy.arange(3),)) != HashItAnyway(
+        (numpy.arange(3) + 1,))
+    assert HashItAnyway(numpy.zeros(2)) != HashItAnyway(
+        numpy.zeros(2, dtype=int))
+    assert fingerprint(numpy.arange(10 ** 4)) != fingerprint(
+        numpy.arange(10 ** 4) * 2)
+    t = Tracker()
+    assert t.track(numpy.arange(3)) == 1
+    assert t.track(numpy.arange(3)) == 2
+
+
+@given(arrays((2, 2), 'uint8'))
+def test_given_works_with_arrays(x):
+    assert x.shape == (2, 2)
+    assert x.dtype == numpy.uint8
@@ -1,5 +1,7 @@
 import hypothesis.params as params
 import pytest
+import random
+from hypothesis.internal.compat import xrange
 
 
 def test_non_empty_subset_on_one_element_does_not_call_random():
@@ -36,3 +38,100 @@ def test_composite_parameter_name_clashes():
             __init__=params.BiasedCoin(0.5),
         )
     assert 'invalid' in e.value.args[0].lower()
+
+
+def test_interval_subset_errors_on_empty_range():
+    with pytest.raises(ValueError):
+        params.IntervalSubset(1, 0)
+
+
+def test_interval_subset_draws_from_its_range():
+    x = params.IntervalSubset(10, 10 ** 9)
+    for _ in range(200):
+        v = x.draw(random)
+        assert len(v) > 0
+        assert 10 <= v[0] <= v[-1] <= 10 ** 9
+
+
+def test_interval_subset_draws_both_intervals_and_points():
+    x = params.IntervalSubset(0, 10 ** 9)
+    kinds = set(type(x.draw(random)) for _ in range(100))
+    assert kinds == set((tuple, xrange))
+
+
+def test_non_empty_subset_is_never_empty_and_keeps_order():
+    x = params.NonEmptySubset(range(1000), activation_chance=0.001)
+    for _ in range(200):
+        v = x.draw(random)
+        assert v
+        assert v == sorted(set(v))
+
+
+def test_non_empty_subset_includes_elements_at_the_right_rate():
+    n = 10
+    p = 0.1
+    x = params.NonEmptySubset(range(n), activation_chance=p)
+    rnd = random.Random(0)
+    counts = [0] * n
+    draws = 20000
+    for _ in range(draws):
+        for i in x.draw(rnd):
+            counts[i] += 1
+    # Conditioning on being non-empty raises the rate to p / (1 - (1-p)^n)
+    expected = draws * p / (1 - (1 - p) ** n)
+    for c in counts:
+        assert abs(c - expected) < 0.1 * expected
+
+
+def test_non_empty_subset_of_many_elements_draws_quickly():
+    x = params.NonEmptySubset(range(10 ** 6))
+    for _ in range(100):
+        assert len(x.draw(random)) < 100
+
+
+def naive_draw(parameter, rnd):
+    if isinstance(parameter, params.CompositeParameter):
+        bits = [naive_draw(getattr(parameter, c), rnd)
+                for c in parameter.children]
+        if parameter.Result == tuple:
+            return tuple(bits)
+        return parameter.Result(*bits)
+    if isinstance(parameter, params.DictParameter):
+        return dict(
+            (k, naive_draw(v, rnd))
+            for k, v in parameter.dict_of_parameters.items())
+    return parameter.draw(rnd)
+
+
+def nested_parameter(depth):
+    p = params.UniformFloatParameter(0, 1)
+    for i in xrange(depth):
+        if i % 3 == 0:
+            p = params.CompositeParameter(p, params.BiasedCoin(0.5))
+        elif i % 3 == 1:
+            p = params.CompositeParameter(
+                child=p, coin=params.BiasedCoin(0.5))
+        else:
+            p = params.DictParameter({'x': p, 1: params.GammaParameter(1, 1)})
+    return p
+
+
+@pytest.mark.parametrize('depth', [0, 1, 5, 100])
+def test_compiled_draws_match_drawing_each_child(depth):
+    p = nested_parameter(depth)
+    for seed in xrange(10):
+        assert p.draw(random.Random(seed)) == naive_draw(
+            p, random.Random(seed))
+
+
+def test_compiles_empty_composites():
+    assert params.CompositeParameter().draw(random) == ()
+    assert params.DictParameter({}).draw(random) == {}
+
+
+def test_composite_parameters_are_compiled_once():
+    p = params.CompositeParameter(params.BiasedCoin(0.5))
+    p.draw(random)
+    compiled = p.compiled_draw
+    p.draw(random)
+    assert p.compiled_draw is compiled
@@ -150,7 +150,7 @@ def test_can_falsify_false_things(desc):
     assume(size(desc) <= MAX_SIZE)
     x = verifier.falsify(lambda x: False, desc)[0]
     strategy = test_table.strategy(desc)
-    assert not list(strategy.simplify(x))
+    assert not list(strategy.simplify_value(x))
 
 
 @given([descriptor_strategy], verifier=verifier)
@@ -161,7 +161,7 @@ def test_can_falsify_false_things_with_many_args(descs):
     descs = tuple(descs)
     x = verifier.falsify(lambda *args: False, *descs)
     strategy = test_table.strategy(descs)
-    assert not list(strategy.simplify(x))
+    assert not list(strategy.simplify_value(x))
 
 
 @given(descriptor_strategy, verifier=verifier)
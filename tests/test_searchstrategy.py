@@ -4,10 +4,12 @@ import hypothesis.descriptors as descriptors
 import hypothesis.params as params
 from hypothesis.internal.tracker import Tracker
 from collections import namedtuple
-from hypothesis.internal.compat import xrange
+from hypothesis.internal.compat import xrange, unichr
 from hypothesis.internal.compat import text_type, binary_type
 import random
+import unicodedata
 import pytest
+from itertools import islice
 
 
 def strategy(*args, **kwargs):
@@ -285,6 +287,16 @@ def test_strategy_for_integer_range_produces_only_integers_in_that_range():
         assert 1 <= x <= 10
 
 
+def test_strategy_for_large_integer_range_stays_in_range():
+    some_integers = strategy(descriptors.IntegerRange(-10, 10 ** 12))
+    for _ in xrange(100):
+        pv = some_integers.parameter.draw(random)
+        for x in [some_integers.produce(random, pv)] + \
+                some_integers.produce_many(random, pv, 10):
+            assert -10 <= x <= 10 ** 12
+    assert minimize(some_integers, 10 ** 11) == -10
+
+
 def test_strategy_for_integer_range_can_produce_end_points():
     table = ss.StrategyTable()
     some_integers = table.strategy(descriptors.IntegerRange(1, 10))
@@ -436,6 +448,38 @@ def test_one_of_mutable_and_immutable_is_mutable():
         descriptors.one_of([int, [float]])).has_immutable_data
 
 
+def test_just_of_primitives_is_immutable():
+    assert strategy(descriptors.just(1)).has_immutable_data
+    assert strategy(descriptors.just((1, 'a', None))).has_immutable_data
+    assert not strategy(descriptors.just([1])).has_immutable_data
+    assert not strategy(descriptors.just((1, [1]))).has_immutable_data
+
+
+def test_copies_share_no_mutable_parts(monkeypatch):
+    def no_deepcopy(x):
+        assert False, 'deepcopy(%r)' % (x,)  # pragma: no cover
+    monkeypatch.setattr(strat, 'deepcopy', no_deepcopy)
+    s = strategy(([(int, [int])], {'a': [int]}, {int}, descriptors.one_of(
+        [int, [bool]])))
+    x = ([(1, [2])], {'a': [3]}, {4}, [True])
+    y = s.copy(x)
+    assert y == x
+    y[0].append((0, [0]))
+    y[0][0][1].append(5)
+    y[1]['a'].append(6)
+    y[2].add(7)
+    y[3].append(False)
+    assert x == ([(1, [2])], {'a': [3]}, {4}, [True])
+
+
+def test_one_of_fixed_keys_dicts_copies_with_the_right_child():
+    s = strategy(descriptors.one_of([{'a': [int]}, {'b': [bool]}]))
+    x = {'b': [True]}
+    assert s.could_have_produced(x)
+    assert not s.element_strategies[0].could_have_produced(x)
+    assert s.copy(x) == x
+
+
 def test_random_is_mutable():
     assert not strategy(random.Random).has_immutable_data
 
@@ -501,3 +545,369 @@ def test_list_distinguishes_on_elements():
 def test_set_distinguishes_on_elements():
     s = strategy({int})
     assert not s.could_have_produced({(1, 2)})
+
+
+@pytest.mark.parametrize('d', [
+    int, bool, float, descriptors.integers_in_range(3, 7),
+    descriptors.floats_in_range(-1, 1), (int, bool), [float], {int},
+    descriptors.one_of([int, text_type]), {'a': int},
+])
+@pytest.mark.parametrize('n', [0, 1, 10, 100])
+def test_produce_many_produces_valid_values(d, n):
+    s = strategy(d)
+    r = random.Random(n)
+    values = s.produce_many(r, s.parameter.draw(r), n)
+    assert len(values) == n
+    for v in values:
+        assert s.could_have_produced(v)
+
+
+def test_produce_many_is_deterministic_given_the_seed():
+    s = strategy([(int, float)])
+    pv = s.parameter.draw(random.Random(1))
+    assert (
+        s.produce_many(random.Random(2), pv, 50) ==
+        s.produce_many(random.Random(2), pv, 50)
+    )
+
+
+def test_shrinks_long_lists_in_logarithmically_many_steps():
+    s = strategy([bool])
+    x = [False] * 1000
+    x[500] = True
+    calls = []
+
+    def has_true(xs):
+        calls.append(xs)
+        return True in xs
+
+    assert last(s.simplify_such_that(x, has_true)) == [True]
+    assert len(calls) <= 200
+
+
+def test_wide_tuples_shrink_with_a_bounded_number_of_pairs():
+    s = strategy((int,) * 8)
+    calls = []
+
+    def all_large(xs):
+        calls.append(xs)
+        return all(x >= 10 for x in xs)
+
+    assert last(s.simplify_such_that((100,) * 8, all_large)) == (10,) * 8
+    assert len(calls) <= 500
+
+
+def test_tuple_shrinking_retries_positions_after_other_changes():
+    s = strategy((int, int))
+
+    def constrained(xs):
+        x, y = xs
+        return x + y >= 10 and (x <= 5 or y >= 5)
+
+    assert sum(last(s.simplify_such_that((20, 20), constrained))) == 10
+
+
+def test_tuple_simplify_bounds_pairwise_candidates():
+    s = strategy((int,) * 8)
+    n_single = sum(len(list(s.element_strategies[i].simplify(100)))
+                   for i in range(8))
+    assert len(list(s.simplify((100,) * 8))) <= (
+        n_single + strat.TupleStrategy.MAX_PAIRWISE)
+
+
+def test_ints_shrink_to_a_boundary_by_bisection():
+    s = strategy(int)
+    calls = []
+
+    def large(x):
+        calls.append(x)
+        return x >= 10 ** 6
+
+    assert last(s.simplify_such_that(10 ** 12, large)) == 10 ** 6
+    assert len(calls) <= 100
+
+
+def test_bounded_ints_shrink_to_a_boundary_by_bisection():
+    s = strat.BoundedIntStrategy(0, 10 ** 5)
+    calls = []
+
+    def large(x):
+        calls.append(x)
+        return 1000 <= x <= 50000
+
+    assert last(s.simplify_such_that(40000, large)) == 1000
+    assert len(calls) <= 100
+    assert all(0 <= x <= 10 ** 5 for x in calls)
+
+
+def test_bounded_int_ranks_round_trip():
+    s = strat.BoundedIntStrategy(-3, 4)
+    ranks = [s.rank(x) for x in range(-3, 5)]
+    assert sorted(ranks) == list(range(8))
+    for x in range(-3, 5):
+        assert s.unrank(s.rank(x)) == x
+
+
+def test_ints_shrink_past_values_the_bisection_cannot_accept():
+    s = strategy(int)
+    assert last(s.simplify_such_that(
+        1000, lambda x: x % 2 == 0 and x >= 10)) == 10
+
+
+def test_unicode_characters_are_produced_from_the_requested_categories():
+    s = strategy(descriptors.characters(categories=['Lu', 'Nd']))
+    for _ in xrange(100):
+        pv = s.parameter.draw(random)
+        for c in [s.produce(random, pv)] + s.produce_many(random, pv, 10):
+            assert s.could_have_produced(c)
+            assert unicodedata.category(c) in ('Lu', 'Nd')
+
+
+def test_unicode_characters_can_come_from_all_of_unicode():
+    s = strategy(descriptors.characters())
+    found = set()
+    for _ in xrange(100):
+        found.add(s.produce(random, s.parameter.draw(random)))
+    assert any(ord(c) > 0xFFFF for c in found)
+    assert all(s.could_have_produced(c) for c in found)
+
+
+def test_unicode_characters_simplify_to_zero():
+    s = strategy(descriptors.characters())
+    assert minimize(s, unichr(0x10FFFF)) == '0'
+    assert minimize(s, unichr(0x20)) == '0'
+
+
+def test_unicode_characters_simplify_to_lowest_without_zero():
+    s = strategy(descriptors.characters(categories=['Lu']))
+    assert minimize(s, 'Q') == 'A'
+    assert last(s.simplify_such_that('Q', lambda c: c >= 'K')) == 'K'
+
+
+def test_unicode_characters_rank_round_trips():
+    s = strategy(descriptors.characters(min_codepoint=32, max_codepoint=200))
+    for i in xrange(len(s.intervals)):
+        assert s.rank(s.unrank(i)) == i
+
+
+def test_unicode_characters_reject_empty_sets():
+    with pytest.raises(ValueError):
+        strategy(descriptors.characters(
+            categories=['Lu'], min_codepoint=0, max_codepoint=10))
+
+
+def test_text_and_bytes_strategies_produce_their_types():
+    for descriptor, strategy_type in [
+        (text_type, strat.TextStrategy), (binary_type, strat.BytesStrategy)
+    ]:
+        s = strategy(descriptor)
+        assert isinstance(s, strategy_type)
+        for _ in xrange(50):
+            pv = s.parameter.draw(random)
+            for x in [s.produce(random, pv)] + s.produce_many(random, pv, 5):
+                assert isinstance(x, descriptor)
+                assert s.could_have_produced(x)
+                for y in islice(s.simplify(x), 50):
+                    assert isinstance(y, descriptor)
+                    assert s.could_have_produced(y)
+
+
+def test_bytes_can_be_uniformly_random():
+    s = strategy(binary_type)
+    found = set()
+    for _ in xrange(100):
+        found.update(bytearray(s.produce(random, s.parameter.draw(random))))
+    assert len(found) == 256
+
+
+def test_text_simplifies_by_deleting_and_simplifying_characters():
+    s = strategy(text_type)
+    assert last(s.simplify_such_that(
+        text_type('xyzzyabc'), lambda x: 'b' in x)) == 'b'
+    assert minimize(s, text_type('hello')) == ''
+
+
+def test_bytes_simplify_to_short_simple_values():
+    s = strategy(binary_type)
+    assert last(s.simplify_such_that(
+        b'\x05\x10\x80\x01' * 100, lambda x: len(x) >= 3)) == b'\x00' * 3
+
+
+def example_size(x):
+    if isinstance(x, (text_type, binary_type)):
+        return len(x)
+    if isinstance(x, dict):
+        return sum(example_size(v) for v in x.values())
+    if isinstance(x, (list, tuple, set, frozenset)):
+        return sum(example_size(y) for y in x)
+    return 1
+
+
+@pytest.mark.parametrize('descriptor', [
+    [[[int]]],
+    ([int], {'a': [[bool]], 'b': text_type}),
+    [descriptors.one_of([[int], binary_type, {int}])],
+])
+def test_nested_examples_stay_within_budget(descriptor):
+    s = strategy(descriptor)
+    for _ in xrange(20):
+        pv = s.parameter.draw(random)
+        for x in [s.produce_within(random, pv, 500)] + \
+                s.produce_many_within(random, pv, 5, 500):
+            assert s.could_have_produced(x)
+            assert example_size(x) <= 500
+
+
+def test_budget_does_not_change_small_examples():
+    s = strategy([int])
+    pv = s.parameter.draw(random)
+    seed = random.getrandbits(64)
+    assert s.produce(random.Random(seed), pv) == s.produce_within(
+        random.Random(seed), pv, 10 ** 9)
+
+
+def test_sets_from_small_domains_come_in_every_size():
+    s = strategy({bool})
+    sizes = set()
+    for _ in xrange(200):
+        x = s.produce(random, s.parameter.draw(random))
+        assert s.could_have_produced(x)
+        sizes.add(len(x))
+    assert sizes == set((0, 1, 2))
+
+
+def test_sets_do_not_draw_far_more_elements_than_they_need():
+    s = strategy({descriptors.integers_in_range(0, 3)})
+    calls = [0]
+    original = s.element_strategy.produce_many_within
+
+    def counting(random, pv, n, budget):
+        calls[0] += n
+        return original(random, pv, n, budget)
+
+    s.element_strategy.produce_many_within = counting
+    for _ in xrange(100):
+        x = s.produce(random, s.parameter.draw(random))
+        assert len(x) <= 4
+    assert calls[0] <= 100 * (4 + 10)
+
+
+def test_cardinalities():
+    assert strategy(bool).cardinality() == 2
+    assert strategy(int).cardinality() is None
+    assert strategy(descriptors.integers_in_range(1, 10)).cardinality() == 10
+    assert strategy((bool, descriptors.sampled_from('abc'))).cardinality() \
+        == 6
+    assert strategy(descriptors.one_of(
+        [bool, descriptors.just(None)])).cardinality() == 3
+    assert strategy(descriptors.one_of([bool, int])).cardinality() is None
+
+
+def test_sets_simplify_natively():
+    for descriptor in ({int}, frozenset([int])):
+        s = strategy(descriptor)
+        x = type(descriptor)(range(1, 40))
+        for y in islice(s.simplify(x), 100):
+            assert type(y) == type(descriptor)
+        assert minimize(s, x) == type(descriptor)()
+        assert last(s.simplify_such_that(
+            x, lambda y: len(y) >= 3)) == type(descriptor)([0, 1, 2])
+
+
+class CountingStrategy(strat.MappedSearchStrategy):
+    def __init__(self, strategy):
+        super(CountingStrategy, self).__init__(
+            descriptor=X(strategy.descriptor), strategy=strategy)
+        self.packs = 0
+        self.unpacks = 0
+
+    def pack(self, x):
+        self.packs += 1
+        return X(x)
+
+    def unpack(self, x):
+        self.unpacks += 1
+        return x.x
+
+    def could_have_produced(self, x):
+        return isinstance(x, X) and self.mapped_strategy.could_have_produced(
+            x.x)
+
+
+def test_mapped_strategies_shrink_without_unpacking():
+    s = CountingStrategy(strategy([int]))
+    tests = [0]
+
+    def f(x):
+        tests[0] += 1
+        return sum(x.x) >= 10
+
+    result = last(s.simplify_such_that(X(list(range(20))), f))
+    assert sum(result.x) == 10
+    assert s.unpacks == 1
+    assert s.packs <= tests[0]
+
+
+def test_templates_of_collections_round_trip():
+    s = strat.TupleStrategy((
+        strat.FixedKeysDictStrategy({1: CountingStrategy(strategy(int))}),
+        strat.ListStrategy([CountingStrategy(strategy(bool))]),
+    ), tuple)
+    assert not s.has_trivial_templates
+    x = ({1: X(3)}, [X(True), X(False)])
+    template = s.to_template(x)
+    assert template == ({1: 3}, [True, False])
+    y = s.from_template(template)
+    assert y[0][1].x == 3
+    assert [b.x for b in y[1]] == [True, False]
+    for z in s.simplify_value(x):
+        assert s.could_have_produced(z)
+
+
+def test_simplifies_mapped_values_in_one_of_and_sets():
+    text = strat.StringStrategy(
+        strat.ListStrategy([strat.OneCharStringStrategy()]))
+    s = text | strategy(int)
+    assert s.has_trivial_templates
+    assert minimize(s, text_type('hello')) == text_type('')
+    sets = strat.SetStrategy(strat.ListStrategy([text]))
+    assert last(sets.simplify_such_that(
+        set([text_type('hello'), text_type('world')]),
+        lambda x: len(x) >= 2)) == set([text_type(''), text_type('0')])
+
+
+Pair = namedtuple('Pair', ('left', 'right'))
+
+
+@pytest.mark.parametrize('descriptor', [
+    int, (), (int, bool), Pair(int, [float]), [(bool, text_type)],
+    {'a': int, 'b': (bool,)}, descriptors.one_of([int, (bool, float)]),
+    [descriptors.one_of([int, [bool]])],
+])
+def test_compiled_produce_matches_produce_within(descriptor):
+    s = strategy(descriptor)
+    produce = s.compile_produce()
+    for seed in xrange(20):
+        pv = s.parameter.draw(random.Random(seed))
+        for budget in (3, strat.UNLIMITED):
+            assert repr(produce(random.Random(seed), pv, budget)) == repr(
+                s.produce_within(random.Random(seed), pv, budget))
+
+
+def test_compiled_produce_packs_mapped_values():
+    s = CountingStrategy(strategy([int]))
+    pv = s.parameter.draw(random.Random(1))
+    assert s.compile_produce()(random.Random(2), pv, 5).x == \
+        s.produce_within(random.Random(2), pv, 5).x
+
+
+def test_compiling_respects_overridden_produce_within():
+    class AlwaysOne(strat.SearchStrategy):
+        descriptor = int
+        parameter = params.CompositeParameter()
+
+        def produce_within(self, random, pv, budget):
+            return 1
+
+    s = strat.TupleStrategy((AlwaysOne(), strategy(bool)), tuple)
+    assert s.compile_produce()(random, s.parameter.draw(random), 10)[0] == 1
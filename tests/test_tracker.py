@@ -1,4 +1,10 @@
-from hypothesis.internal.tracker import Tracker
+from hypothesis.internal.tracker import (
+    Tracker, FingerprintTracker, BloomTracker, fingerprint,
+    tracker_for_settings,
+)
+from hypothesis.settings import Settings
+from hypothesis.verifier import Verifier, Exhausted
+import pytest
 
 
 def test_track_ints():
@@ -18,3 +24,75 @@ def test_nested_unhashables():
     x = {'foo': [1, 2, {3, 4, 5, 6}], 'bar': 10}
     assert t.track(x) == 1
     assert t.track(x) == 2
+
+
+def test_fingerprints_are_order_sensitive_for_sequences_only():
+    assert fingerprint([1, 2]) != fingerprint([2, 1])
+    assert fingerprint([1, 1]) != fingerprint([])
+    assert fingerprint({1, 2, 3}) == fingerprint({3, 2, 1})
+    assert fingerprint({1: 2, 3: 4}) == fingerprint({3: 4, 1: 2})
+    assert fingerprint({1: 2, 3: 4}) != fingerprint({1: 4, 3: 2})
+    assert fingerprint((1,)) != fingerprint([1])
+    assert fingerprint(1) != fingerprint(1.0)
+
+
+@pytest.mark.parametrize('tracker', [
+    FingerprintTracker(), FingerprintTracker(100), BloomTracker(100),
+])
+def test_alternative_trackers_detect_duplicates(tracker):
+    x = {'foo': [1, 2, {3, 4, 5, 6}], 'bar': 10}
+    assert tracker.track(x) == 1
+    assert tracker.track(x) == 2
+    assert tracker.track([x]) == 1
+    assert 0 <= tracker.false_positive_rate() < 1e-6
+
+
+def test_capped_fingerprint_tracker_forgets_old_values():
+    t = FingerprintTracker(capacity=2)
+    t.track(1)
+    t.track(2)
+    t.track(3)
+    assert len(t.contents) == 2
+    assert t.track(1) == 1
+    assert t.track(3) == 2
+
+
+def test_bloom_tracker_reports_rising_false_positive_rate():
+    t = BloomTracker(10, error_rate=0.01)
+    for i in range(10):
+        t.track(i)
+    rate = t.false_positive_rate()
+    assert 0.001 < rate < 0.1
+    for i in range(10, 100):
+        t.track(i)
+    assert t.false_positive_rate() > rate
+
+
+def test_bloom_tracker_needs_a_capacity():
+    with pytest.raises(ValueError):
+        BloomTracker(0)
+
+
+@pytest.mark.parametrize('name,cls', [
+    ('exact', Tracker),
+    ('fingerprint', FingerprintTracker),
+    ('bloom', BloomTracker),
+])
+def test_trackers_are_selected_by_settings(name, cls):
+    assert isinstance(tracker_for_settings(Settings(tracker=name)), cls)
+
+
+def test_rejects_unknown_tracker():
+    with pytest.raises(ValueError):
+        tracker_for_settings(Settings(tracker='psychic'))
+
+
+@pytest.mark.parametrize('name', ['fingerprint', 'bloom'])
+def test_falsify_with_alternative_trackers(name):
+    verifier = Verifier(settings=Settings(tracker=name))
+    assert verifier.falsify(lambda x: x < 10, int) == (10,)
+    xs, = verifier.falsify(lambda xs: sum(xs) < 10, [int])
+    assert sum(xs) >= 10
+    with pytest.raises(Exhausted):
+        verifier.falsify(lambda x: True, bool)
+    assert verifier.last_statistics.false_positive_rate < 1e-6
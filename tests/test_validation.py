@@ -0,0 +1,83 @@
+from hypothesis.internal.validation import Validator
+from hypothesis.strategytable import StrategyTable
+from hypothesis.settings import Settings
+from hypothesis import Verifier
+import hypothesis.searchstrategy as strat
+import pytest
+
+
+class CountingIntStrategy(strat.RandomGeometricIntStrategy):
+    checks = 0
+
+    def could_have_produced(self, x):
+        CountingIntStrategy.checks += 1
+        return super(CountingIntStrategy, self).could_have_produced(x)
+
+
+class UntrustedIntStrategy(strat.RandomGeometricIntStrategy):
+    pass
+
+
+UntrustedIntStrategy.__module__ = __name__
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        Validator(StrategyTable().strategy(int), 'sometimes')
+
+
+def test_rejects_non_positive_interval():
+    with pytest.raises(ValueError):
+        Validator(StrategyTable().strategy(int), 'sampled', 0)
+
+
+def test_always_checks_everything():
+    validator = Validator(StrategyTable().strategy(int), 'always', 10)
+    assert all(validator.due() for _ in range(20))
+
+
+def test_sampled_checks_every_nth_value():
+    validator = Validator(StrategyTable().strategy(int), 'sampled', 3)
+    assert [validator.due() for _ in range(7)] == [
+        True, False, False, True, False, False, True]
+
+
+def test_trusted_skips_built_in_strategies():
+    table = StrategyTable()
+    validator = Validator(table.strategy([(int, str)]), 'trusted')
+    assert not any(validator.due() for _ in range(20))
+
+
+def test_trusted_checks_strategies_defined_elsewhere():
+    table = StrategyTable()
+    assert not UntrustedIntStrategy().is_trusted()
+    strategy = strat.ListStrategy([UntrustedIntStrategy()])
+    assert not strategy.is_trusted()
+    validator = Validator(strategy, 'trusted')
+    assert all(validator.due() for _ in range(20))
+    assert table.strategy((int, bool)).is_trusted()
+
+
+def test_sampled_validation_is_used_when_shrinking():
+    CountingIntStrategy.checks = 0
+    strategy = CountingIntStrategy()
+    settings = Settings(validation='sampled', validation_interval=1000)
+    list(strategy.simplify_such_that(1000, lambda x: x > 10, settings))
+    assert CountingIntStrategy.checks == 1
+
+
+def test_trusted_validation_is_used_by_the_verifier(monkeypatch):
+    checks = []
+    original = strat.RandomGeometricIntStrategy.could_have_produced
+
+    def could_have_produced(self, x):
+        checks.append(x)
+        return original(self, x)
+    monkeypatch.setattr(
+        strat.RandomGeometricIntStrategy, 'could_have_produced',
+        could_have_produced)
+    Verifier(settings=Settings(validation='trusted')).falsify(
+        lambda x: x < 10, int)
+    assert not checks
+    Verifier().falsify(lambda x: x < 10, int)
+    assert checks
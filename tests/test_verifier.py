@@ -1,4 +1,7 @@
-from hypothesis import Verifier
+from hypothesis import Verifier, Unfalsifiable, Unsatisfiable, assume
+from hypothesis.verifier import SearchResult, merge_search_results
+from hypothesis.internal.statistics import Statistics, PHASES
+import hypothesis.descriptors as descriptors
 from hypothesis.settings import Settings
 from random import Random
 import pytest
@@ -8,3 +11,249 @@ def test_verifier_explodes_when_you_mix_random_and_derandom():
     settings = Settings(derandomize=True)
     with pytest.raises(ValueError):
         Verifier(settings=settings, random=Random())
+
+
+def test_can_falsify_in_multiple_processes():
+    verifier = Verifier(settings=Settings(processes=4))
+    assert verifier.falsify(lambda x: x < 10, int) == (10,)
+
+
+def test_can_prove_unfalsifiable_in_multiple_processes():
+    def addition_commutes(x, y):
+        return x + y == y + x
+
+    verifier = Verifier(settings=Settings(processes=4))
+    with pytest.raises(Unfalsifiable):
+        verifier.falsify(addition_commutes, int, int)
+
+
+def test_can_send_randoms_between_processes():
+    verifier = Verifier(settings=Settings(processes=2))
+    r = verifier.falsify(lambda x: x.randint(0, 10) != 10, Random)[0]
+    assert r.randint(0, 10) == 10
+
+
+class Unpicklable(object):
+    def __init__(self, i):
+        self.i = i
+        self.f = lambda: i
+
+    def __eq__(self, other):
+        return isinstance(other, Unpicklable) and self.i == other.i
+
+    def __hash__(self):
+        return self.i
+
+
+def test_can_find_unpicklable_examples_in_multiple_processes():
+    values = [Unpicklable(i) for i in range(10)]
+    verifier = Verifier(settings=Settings(processes=2))
+    x = verifier.falsify(
+        lambda x: x.i < 5, descriptors.sampled_from(values))[0]
+    assert x.i >= 5
+
+
+def always_large(x):
+    return x < 10
+
+
+def test_derandomized_multiple_processes_agree():
+    def find():
+        verifier = Verifier(settings=Settings(derandomize=True, processes=3))
+        # sampled_from does no simplification so the result is exactly the
+        # example that the winning worker found.
+        return verifier.falsify(
+            always_large, descriptors.sampled_from(range(1000)))
+
+    assert find() == find()
+
+
+def test_multiple_processes_are_reproducible_from_the_same_seed():
+    def find(seed):
+        verifier = Verifier(
+            settings=Settings(processes=3), random=Random(seed))
+        return verifier.falsify(
+            always_large, descriptors.sampled_from(range(1000)))
+
+    for seed in range(5):
+        assert find(seed) == find(seed)
+
+
+def test_repeated_parallel_searches_terminate():
+    verifier = Verifier(settings=Settings(processes=4))
+    for _ in range(20):
+        verifier.falsify(lambda x: len(x) < 3, [int])
+
+
+def test_merged_results_are_only_exhausted_if_every_search_was():
+    exhausted = SearchResult(
+        [], 10, 5, exhausted=True, statistics=Statistics())
+    not_exhausted = SearchResult(
+        [], 20, 20, exhausted=False, statistics=Statistics())
+    merged = merge_search_results([exhausted, not_exhausted])
+    assert not merged.exhausted
+    assert merged.examples_found == 30
+    assert merged.satisfying_examples == 25
+    assert merge_search_results([exhausted, exhausted]).exhausted
+
+
+def test_never_calls_hypothesis_twice_on_the_same_example():
+    calls = []
+
+    def is_small(xs):
+        calls.append(tuple(xs))
+        return sum(xs) < 100
+
+    falsifying_example = Verifier().falsify(is_small, [int])
+    counts = {}
+    for c in calls:
+        counts[c] = counts.get(c, 0) + 1
+    # The first falsifying example is called again when checking for flakiness
+    assert max(counts.values()) <= 2
+    repeated = [c for c, n in counts.items() if n == 2]
+    assert len(repeated) <= 1
+    assert tuple(falsifying_example[0]) in counts
+
+
+def test_falsify_records_statistics_for_every_phase():
+    verifier = Verifier()
+    verifier.falsify(lambda x: x < 10, int)
+    statistics = verifier.last_statistics
+    for phase in PHASES:
+        assert statistics.calls[phase] > 0, phase
+        assert statistics.times[phase] >= 0
+    assert statistics.shrinks_tried > 0
+    assert statistics.calls['test'] == statistics.calls['copy']
+    assert 'shrink' in repr(statistics)
+
+
+def test_failures_carry_their_statistics():
+    def never_satisfied(x):
+        assume(False)
+
+    verifier = Verifier()
+    with pytest.raises(Unsatisfiable) as e:
+        verifier.falsify(never_satisfied, int)
+    statistics = e.value.statistics
+    assert statistics is verifier.last_statistics
+    assert statistics.assumptions_rejected == statistics.calls['test'] > 0
+    assert statistics.calls['shrink'] == 0
+
+
+def test_statistics_are_gathered_from_worker_processes():
+    verifier = Verifier(settings=Settings(processes=2))
+    with pytest.raises(Unfalsifiable) as e:
+        verifier.falsify(lambda x: True, int)
+    assert e.value.statistics.calls['test'] > 0
+    assert e.value.statistics.calls['produce'] >= \
+        e.value.statistics.calls['test']
+
+
+def test_counts_skipped_duplicates():
+    verifier = Verifier()
+    with pytest.raises(Unfalsifiable):
+        verifier.falsify(lambda x: True, bool)
+    assert verifier.last_statistics.duplicates_skipped > 0
+
+
+def test_can_merge_statistics():
+    x = Statistics()
+    x.record('test', 0.0)
+    x.shrinks_tried = 2
+    y = Statistics()
+    y.merge(x)
+    y.merge(x)
+    assert y.calls['test'] == 2
+    assert y.shrinks_tried == 4
+
+
+def test_can_falsify_in_threads():
+    verifier = Verifier(settings=Settings(threads=4))
+    assert verifier.falsify(lambda x: x < 10, int) == (10,)
+    with pytest.raises(Unfalsifiable):
+        verifier.falsify(lambda x, y: x + y == y + x, int, int)
+
+
+def test_runs_examples_on_several_threads():
+    import threading
+    lock = threading.Lock()
+    barrier = threading.Barrier(4, timeout=10)
+    thread_names = set()
+
+    def passes(x):
+        with lock:
+            thread_names.add(threading.current_thread().name)
+        # Only returns once four threads are waiting at the same time.
+        barrier.wait()
+        return True
+
+    verifier = Verifier(settings=Settings(threads=4, max_examples=40))
+    with pytest.raises(Unfalsifiable):
+        verifier.falsify(passes, int)
+    assert len(thread_names) == 4
+    assert threading.current_thread().name not in thread_names
+
+
+def test_threaded_derandomized_falsification_is_deterministic():
+    settings = Settings(threads=4, derandomize=True)
+
+    def is_small(xs):
+        return sum(xs) < 50
+
+    results = [
+        Verifier(settings=settings).falsify(is_small, [int])
+        for _ in range(3)
+    ]
+    assert results[0] == results[1] == results[2]
+
+
+def test_lazy_falsification_finds_ordinary_lists_and_dicts():
+    verifier = Verifier(settings=Settings(lazy=True))
+    xs, = verifier.falsify(lambda xs: sum(xs) < 50, [int])
+    assert type(xs) == list
+    assert sum(xs) >= 50
+    d, = verifier.falsify(lambda d: d['a'] < 10, {'a': int, 'b': [int]})
+    assert type(d) == dict
+    assert type(d['b']) == list
+    assert d['a'] == 10
+
+
+def test_lazy_examples_rejected_early_are_not_generated(monkeypatch):
+    import hypothesis.searchstrategy as strat
+    produced = [0]
+    original = strat.RandomGeometricIntStrategy.produce_many
+
+    def counting_produce_many(self, random, pv, n):
+        produced[0] += n
+        return original(self, random, pv, n)
+
+    monkeypatch.setattr(
+        strat.RandomGeometricIntStrategy, 'produce_many',
+        counting_produce_many)
+
+    def first_is_small(xs):
+        assume(len(xs) > 1 and xs[0] < 3)
+        return True
+
+    def elements_produced(lazy):
+        produced[0] = 0
+        settings = Settings(lazy=lazy, derandomize=True)
+        with pytest.raises((Unfalsifiable, Unsatisfiable)):
+            Verifier(settings=settings).falsify(first_is_small, [int])
+        return produced[0]
+
+    assert elements_produced(True) < elements_produced(False)
+
+
+def test_examples_are_limited_to_the_maximum_size():
+    sizes = []
+
+    def record_size(xs):
+        sizes.append(sum(len(ys) for ys in xs))
+        return True
+
+    settings = Settings(max_example_size=50, max_examples=100)
+    with pytest.raises(Unfalsifiable):
+        Verifier(settings=settings).falsify(record_size, [[int]])
+    assert sizes
+    assert max(sizes) <= 50